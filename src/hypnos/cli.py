@@ -6,7 +6,19 @@ from hypnos.lib import setup_logger
 # We import them inside the handler functions
 
 def handle_wordle(args):
-    if args.mode == "train":
+    if args.mode == "build-book":
+        from hypnos.wordle import book
+        book.main()
+    elif args.mode == "bench":
+        from hypnos.wordle import bench
+        bench.main(length=args.length, workers=args.workers, limit=args.games, seed=args.seed)
+    elif args.mode == "stub":
+        from hypnos.wordle import stub
+        stub.main(port=args.port, rate_limit=args.rate_limit, length=args.length)
+    elif args.mode == "train" and args.concurrent:
+        from hypnos.wordle import multitrain
+        multitrain.main(base_url=args.base_url or multitrain.BASE_URL, games=args.games, cooldown=args.cooldown)
+    elif args.mode == "train":
         from hypnos.wordle import train
         train.main()
     else:
@@ -40,8 +52,21 @@ def handle_trivia(args):
             solve.solve_theme(theme)
 
 def handle_2048(args):
-    from hypnos.twothousandfortyeight import solve
-    solve.main()
+    if args.mode == "train":
+        from hypnos.twothousandfortyeight import ntuple
+        ntuple.main(games=args.games or 1000, seed=args.seed)
+    elif args.mode == "tune":
+        from hypnos.twothousandfortyeight import tune
+        tune.main(generations=args.generations, population=args.population, games=args.games or 8,
+                  seed=args.seed, workers=args.workers, max_moves=args.max_moves, budget_ms=args.budget_ms)
+    elif args.mode == "bench":
+        from hypnos.twothousandfortyeight import bench
+        bench.main(games=args.games or 8, seed=args.seed, workers=args.workers,
+                   budget_ms=args.budget_ms, max_moves=args.max_moves, evaluator=args.evaluator)
+    else:
+        from hypnos.twothousandfortyeight import solve
+        solve.main(workers=args.workers, split=args.split, budget_ms=args.budget_ms, evaluator=args.evaluator,
+                   speculative=args.speculative)
 
 def main():
     parser = argparse.ArgumentParser(description="Hypnos 2026 Bot Suite")
@@ -49,7 +74,16 @@ def main():
 
     # Wordle
     p_wordle = subparsers.add_parser("wordle", help="Wordle solver")
-    p_wordle.add_argument("mode", choices=["solve", "train"], nargs="?", default="solve", help="Operation mode")
+    p_wordle.add_argument("mode", choices=["solve", "train", "bench", "build-book", "stub"], nargs="?", default="solve", help="Operation mode (bench = offline games against a local referee, build-book = precompute the opening guesses per word length, stub = local fake API for offline training)")
+    p_wordle.add_argument("--concurrent", action="store_true", help="train: one concurrent session per account of .env (AUTH_TOKEN, AUTH_TOKEN_2, ...)")
+    p_wordle.add_argument("--base-url", type=str, default=None, help="train --concurrent: API root, e.g. the URL printed by the stub mode")
+    p_wordle.add_argument("--games", "-n", type=int, default=None, help="train --concurrent: games per account (default: endless); bench: number of hidden words sampled (default: all)")
+    p_wordle.add_argument("--cooldown", type=float, default=13.0, help="train --concurrent: pause between two games of an account, in seconds")
+    p_wordle.add_argument("--port", type=int, default=8026, help="stub: port to listen on")
+    p_wordle.add_argument("--rate-limit", type=float, default=0.0, help="stub: requests per second before answering 429 (0 = unlimited)")
+    p_wordle.add_argument("--length", type=int, default=5, help="bench/stub: length of the hidden words")
+    p_wordle.add_argument("--workers", "-w", type=int, default=0, help="bench: worker processes, 0 = serial")
+    p_wordle.add_argument("--seed", type=int, default=0, help="bench: seed of the word sample (with --games)")
     p_wordle.set_defaults(func=handle_wordle)
 
     # Breakout
@@ -69,6 +103,17 @@ def main():
 
     # 2048
     p_2048 = subparsers.add_parser("2048", help="2048 Solver")
+    p_2048.add_argument("mode", choices=["solve", "train", "bench", "tune"], nargs="?", default="solve", help="Operation mode (train = n-tuple TD learning, bench = offline self-play benchmark, tune = heuristic weight search)")
+    p_2048.add_argument("--workers", "-w", type=int, default=0, help="Worker processes: parallel search (solve) or parallel games (bench/tune), 0 = serial")
+    p_2048.add_argument("--split", choices=["root", "chance"], default="chance", help="Parallel task granularity: root moves or root x first chance node")
+    p_2048.add_argument("--budget-ms", type=float, default=None, help="Think time per move in ms (iterative deepening instead of the fixed depth ladder)")
+    p_2048.add_argument("--speculative", action="store_true", help="solve: search likely post-spawn boards while the move request is in flight")
+    p_2048.add_argument("--evaluator", choices=["heuristic", "ntuple"], default="heuristic", help="solve/bench: leaf evaluator")
+    p_2048.add_argument("--games", "-n", type=int, default=None, help="train/bench/tune: number of games (per candidate for tune)")
+    p_2048.add_argument("--seed", type=int, default=0, help="train/bench/tune: seed of the first game (game i uses seed + i)")
+    p_2048.add_argument("--max-moves", type=int, default=None, help="bench/tune: stop each game after this many moves")
+    p_2048.add_argument("--generations", type=int, default=10, help="tune: number of generations")
+    p_2048.add_argument("--population", type=int, default=12, help="tune: candidates per generation")
     p_2048.set_defaults(func=handle_2048)
 
     # Parse
@@ -0,0 +1,226 @@
+"""
+HTTP client shared by every game.
+
+get_session() returns an ApiSession: a requests.Session with the platform's
+browser headers and auth cookies, plus
+
+- connection pooling: keep-alive connections reused across requests (size the
+  pool to the number of threads sharing the session);
+- retries with jittered exponential backoff on 429, 5xx and connection
+  errors, never shorter than the server's Retry-After. A POST is only
+  replayed on 429 / 503 or when the connection could not even be opened
+  (connect timeout, refused, DNS): after a read timeout, a dropped connection
+  or another 5xx the server may already have applied it;
+- per-endpoint timeouts, keyed by the endpoint name (last path segment that
+  is not an id: "guess", "move", "new-game", ...);
+- latency metrics per endpoint (count, errors, retries, p50/p95/max).
+
+    session = get_session('https://play.hypnos2026.fr/game/wordle/', timeouts={"guess": 5})
+    response = session.post(f"{BASE_URL}/{game_id}/guess", json={"guess": word})
+    session.log_metrics()
+"""
+
+import email.utils
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from dotenv import load_dotenv
+from urllib3.exceptions import NewConnectionError
+
+from hypnos.lib import setup_logger
+
+logger = setup_logger("hypnos_http")
+
+ORIGIN = "https://play.hypnos2026.fr"
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36")
+# Client hints envoyés par ce Chrome avec un fetch() same-origin (cohérents avec USER_AGENT)
+SEC_CH_UA = '"Google Chrome";v="143", "Chromium";v="143", "Not A(Brand";v="24"'
+
+DEFAULT_TIMEOUT = 10.0
+RETRIES = 3
+POOL_SIZE = 10
+# Backoff : délai max de la tentative n = min(BACKOFF_MAX, BACKOFF_BASE * 2**n), tiré au hasard en dessous
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Réponses garantissant que la requête n'a pas été traitée : rejouables quelle que soit la méthode
+NOT_PROCESSED_STATUSES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Échantillons de latence gardés par endpoint pour les percentiles
+METRICS_WINDOW = 1000
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{8,})$")
+
+
+def get_cookies() -> Dict[str, Optional[str]]:
+    """Cookies d'authentification lus dans l'environnement (.env)."""
+    load_dotenv()
+    return {'auth_token': os.getenv("AUTH_TOKEN"), 'csrf_token': os.getenv("CSRF_TOKEN")}
+
+
+def get_headers(referer: str, csrf_token: Optional[str]) -> Dict[str, str]:
+    """En-têtes d'un fetch() de Chrome sur la page `referer` de la plateforme (jeu complet)."""
+    return {
+        'accept': '*/*',
+        'accept-language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
+        'content-type': 'application/json',
+        'origin': ORIGIN,
+        'referer': referer,
+        'priority': 'u=1, i',
+        'sec-ch-ua': SEC_CH_UA,
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': '"Windows"',
+        'sec-fetch-dest': 'empty',
+        'sec-fetch-mode': 'cors',
+        'sec-fetch-site': 'same-origin',
+        'user-agent': USER_AGENT,
+        'x-csrf-token': csrf_token or "",
+    }
+
+
+def endpoint_name(url: str) -> str:
+    """Dernier segment du chemin qui n'est pas un identifiant : "/api/arg/wordle/<id>/guess" -> "guess"."""
+    for segment in reversed(urlsplit(url).path.strip("/").split("/")):
+        if segment and not _ID_SEGMENT.match(segment):
+            return segment
+    return "/"
+
+
+def retry_after(response: requests.Response) -> Optional[float]:
+    """Délai Retry-After en secondes (nombre ou date HTTP), None s'il est absent ou illisible."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, minimum: Optional[float] = None) -> float:
+    """Backoff exponentiel à jitter complet, au moins `minimum` (Retry-After)."""
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+    return max(delay, minimum or 0.0)
+
+
+def failed_before_send(error: requests.RequestException) -> bool:
+    """Vrai si la connexion n'a pas pu s'ouvrir : la requête n'a pas quitté le client."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    # ConnectionError(MaxRetryError(reason=NewConnectionError)) pour un refus ou un échec DNS
+    reason = getattr(error.args[0], "reason", error.args[0])
+    return isinstance(reason, NewConnectionError)
+
+
+class LatencyMetrics:
+    """Latences et erreurs par endpoint (thread-safe : la session peut être partagée)."""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.window = window
+        self.samples: Dict[str, Deque[float]] = {}
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float, ok: bool, retried: bool) -> None:
+        with self._lock:
+            self.samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+            counts = self.counts.setdefault(endpoint, {"requests": 0, "errors": 0, "retries": 0})
+            counts["requests"] += 1
+            counts["errors"] += not ok
+            counts["retries"] += retried
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """{endpoint: {requests, errors, retries, p50_ms, p95_ms, max_ms}}"""
+        with self._lock:
+            report = {}
+            for endpoint, samples in self.samples.items():
+                ordered = sorted(samples)
+                report[endpoint] = {
+                    **self.counts[endpoint],
+                    "p50_ms": ordered[len(ordered) // 2] * 1000,
+                    "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+                    "max_ms": ordered[-1] * 1000,
+                }
+            return report
+
+
+class ApiSession(requests.Session):
+    def __init__(self, retries: int = RETRIES, timeout: float = DEFAULT_TIMEOUT,
+                 timeouts: Optional[Dict[str, float]] = None, pool_size: int = POOL_SIZE):
+        super().__init__()
+        self.retries = retries
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.metrics = LatencyMetrics()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs) -> requests.Response:
+        """
+        requests.Session.request avec timeout par endpoint et retries. Après le dernier
+        essai, la dernière réponse (429, 5xx) est renvoyée, ou l'exception relevée.
+        """
+        endpoint = endpoint_name(url)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeouts.get(endpoint, self.timeout))
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            started = time.perf_counter()
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # Une fois la requête envoyée (timeout de lecture, connexion coupée), le serveur a pu l'appliquer
+                retry = not last and (idempotent or failed_before_send(e))
+                self.metrics.record(endpoint, time.perf_counter() - started, ok=False, retried=retry)
+                if not retry:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"{method} {endpoint}: {e.__class__.__name__}, retrying in {delay:.1f}s "
+                               f"({attempt + 1}/{self.retries})")
+                time.sleep(delay)
+                continue
+            statuses = RETRY_STATUSES if idempotent else NOT_PROCESSED_STATUSES
+            retry = response.status_code in statuses and not last
+            self.metrics.record(endpoint, time.perf_counter() - started, ok=response.status_code < 400,
+                                retried=retry)
+            if not retry:
+                return response
+            delay = backoff_delay(attempt, retry_after(response))
+            logger.warning(f"{method} {endpoint}: {response.status_code}, retrying in {delay:.1f}s "
+                           f"({attempt + 1}/{self.retries})")
+            response.close()
+            time.sleep(delay)
+
+    def log_metrics(self, label: str = "") -> None:
+        prefix = f"[{label}] " if label else ""
+        for endpoint, stats in sorted(self.metrics.report().items()):
+            logger.info(f"{prefix}{endpoint}: {stats['requests']} request(s), {stats['errors']} error(s), "
+                        f"{stats['retries']} retried, p50 {stats['p50_ms']:.0f} ms, "
+                        f"p95 {stats['p95_ms']:.0f} ms, max {stats['max_ms']:.0f} ms")
+
+
+def get_session(referer: str, cookies: Optional[Dict[str, Optional[str]]] = None, **options) -> ApiSession:
+    """
+    Session authentifiée pour la page `referer` (cookies de .env par défaut).
+    `options` : retries, timeout, timeouts (par endpoint), pool_size (voir ApiSession).
+    """
+    cookies = cookies if cookies is not None else get_cookies()
+    session = ApiSession(**options)
+    session.headers.update(get_headers(referer, cookies.get('csrf_token')))
+    session.cookies.update({k: v for k, v in cookies.items() if v})
+    return session
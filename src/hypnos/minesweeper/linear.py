@@ -0,0 +1,79 @@
+"""
+Linear-algebra deduction over the frontier.
+
+Each frontier constraint is a row of A x = b, x being 0/1 over the hidden
+cells it touches. Per connected component, the integer matrix [A | b] is
+brought to reduced row echelon form with fraction-free Gauss-Jordan steps
+(one vectorized update of all rows per pivot, rows divided by their gcd).
+Every reduced row is a linear combination of constraints, checked against
+the 0/1 bounds:
+
+- b equal to the sum of its positive coefficients: the cells with a positive
+  coefficient are mines, those with a negative one are safe;
+- b equal to the sum of its negative coefficients: the reverse.
+
+This covers the pairwise subset rule and the patterns chaining more than two
+constraints. Components larger than MAX_CELLS cells, or whose coefficients
+grow past MAX_COEFFICIENT, are left to the probability stage.
+"""
+
+from typing import List, Set, Tuple
+
+import numpy as np
+
+from hypnos.minesweeper.probability import Cell, Constraint, components
+
+MAX_CELLS = 400
+# Coefficients bornés pour que les produits d'une étape tiennent en int64
+MAX_COEFFICIENT = 2 ** 20
+
+
+def reduce_rows(matrix: np.ndarray) -> np.ndarray:
+    """Forme échelonnée réduite entière de [A | b] (dernière colonne = b)."""
+    matrix = matrix.copy()
+    rank = 0
+    for col in range(matrix.shape[1] - 1):
+        candidates = np.flatnonzero(matrix[rank:, col])
+        if not len(candidates):
+            continue
+        pivot_row = rank + candidates[0]
+        matrix[[rank, pivot_row]] = matrix[[pivot_row, rank]]
+        pivot = matrix[rank]
+        others = matrix[:, col] != 0
+        others[rank] = False
+        matrix[others] = matrix[others] * pivot[col] - np.outer(matrix[others, col], pivot)
+        gcd = np.gcd.reduce(matrix, axis=1)
+        matrix //= np.where(gcd == 0, 1, gcd)[:, None]
+        rank += 1
+        if rank == len(matrix) or np.abs(matrix).max() > MAX_COEFFICIENT:
+            break
+    return matrix
+
+
+def bound_deductions(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Masques (sûres, mines) sur les colonnes, déduits des bornes 0/1 de chaque ligne."""
+    coef, b = matrix[:, :-1], matrix[:, -1]
+    positive, negative = coef > 0, coef < 0
+    upper = (b == np.where(positive, coef, 0).sum(axis=1)) & (positive | negative).any(axis=1)
+    lower = (b == np.where(negative, coef, 0).sum(axis=1)) & (positive | negative).any(axis=1)
+    mines = (positive & upper[:, None]) | (negative & lower[:, None])
+    safe = (negative & upper[:, None]) | (positive & lower[:, None])
+    return safe.any(axis=0), mines.any(axis=0)
+
+
+def forced_cells(constraints: List[Constraint]) -> Tuple[Set[Cell], Set[Cell]]:
+    """Cases cachées forcément sûres et forcément minées, composante par composante."""
+    safe, mines = set(), set()
+    for component in components(constraints):
+        cells = sorted({cell for cell_set, _ in component for cell in cell_set})
+        if len(cells) > MAX_CELLS:
+            continue
+        index = {cell: i for i, cell in enumerate(cells)}
+        matrix = np.zeros((len(component), len(cells) + 1), dtype=np.int64)
+        for row, (cell_set, remaining) in enumerate(component):
+            matrix[row, [index[cell] for cell in cell_set]] = 1
+            matrix[row, -1] = remaining
+        is_safe, is_mine = bound_deductions(reduce_rows(matrix))
+        safe.update(cells[i] for i in np.flatnonzero(is_safe))
+        mines.update(cells[i] for i in np.flatnonzero(is_mine))
+    return safe, mines
@@ -0,0 +1,257 @@
+"""
+Exact mine probabilities over the frontier.
+
+Input: the frontier constraints of the solver (revealed cell -> hidden
+neighbors, mines left among them), the number of hidden cells outside the
+frontier and the number of mines left on the board.
+
+- The constraints are split into connected components (constraints sharing
+  hidden cells); components are independent except through the total.
+- In a component, cells covered by exactly the same constraints are
+  interchangeable and grouped in a class: a class of s cells holding m mines
+  counts for C(s, m) configurations, so only mine counts per class are
+  enumerated.
+- Classes are swept in breadth-first order, the state between two classes
+  being the mines still due by the constraints open at that point.
+  Configurations reaching the same state are merged (memoization), so a long
+  frontier costs its length times the few states of its narrow cut, not the
+  number of configurations. A forward and a backward sweep give, for every
+  mine count k of the component, its weight and the expected mines of each
+  class.
+- Components are combined by convolution over their mine counts, each total
+  K weighted by C(unconstrained cells, mines left - K).
+
+Solved components are cached on their constraints: between two guesses most
+of the frontier has not changed. A component whose sweep goes over MAX_STATES
+states in total (wide 2D blobs rather than frontier lines) falls back to
+the local estimate (worst constraint density), which bounds the cost.
+"""
+
+from collections import defaultdict, deque
+from functools import lru_cache
+from math import comb, lgamma
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+Cell = Tuple[int, int]
+# (cases cachées, mines restantes) pour chaque case de la frontière
+Constraint = Tuple[FrozenSet[Cell], int]
+
+# Densité supposée quand le serveur ne donne pas le nombre de mines
+MINE_DENSITY = 0.16
+# États max du balayage d'une composante avant de renoncer au calcul exact
+MAX_STATES = 5000
+
+
+def components(constraints: List[Constraint]) -> List[List[Constraint]]:
+    """Regroupe les contraintes liées par des cases cachées communes (union-find)."""
+    parent = list(range(len(constraints)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[Cell, int] = {}
+    for i, (cells, _) in enumerate(constraints):
+        for cell in cells:
+            j = owner.setdefault(cell, i)
+            parent[find(i)] = find(j)
+    groups = defaultdict(list)
+    for i, constraint in enumerate(constraints):
+        groups[find(i)].append(constraint)
+    return list(groups.values())
+
+
+def _sweep_order(classes: List[FrozenSet[int]]) -> List[int]:
+    """Ordre en largeur depuis une classe périphérique : coupe étroite le long de la frontière."""
+    by_constraint = defaultdict(list)
+    for i, members in enumerate(classes):
+        for q in members:
+            by_constraint[q].append(i)
+
+    def bfs(start):
+        seen, order, queue = {start}, [], deque([start])
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            for q in sorted(classes[i]):
+                for j in by_constraint[q]:
+                    if j not in seen:
+                        seen.add(j)
+                        queue.append(j)
+        return order
+
+    return bfs(bfs(0)[-1])
+
+
+def _shift_add(target: np.ndarray, poly: np.ndarray, m: int, weight: float) -> None:
+    """target += weight * x^m * poly (tronqué à la taille de target)"""
+    if m == 0:
+        target += weight * poly
+    else:
+        target[m:] += weight * poly[:-m]
+
+
+@lru_cache(maxsize=512)
+def solve_component(constraints: FrozenSet[Constraint]):
+    """
+    Composante -> (classes, weights, expected) ou None si trop de configurations :
+    classes = [cases], weights[k] = configurations à k mines,
+    expected[j][k] = somme des mines de la classe j sur ces configurations.
+    """
+    constraints = sorted(constraints, key=lambda item: sorted(item[0]))
+    cover = defaultdict(set)
+    for q, (cells, _) in enumerate(constraints):
+        for cell in cells:
+            cover[cell].add(q)
+    grouped = defaultdict(list)
+    for cell, members in cover.items():
+        grouped[frozenset(members)].append(cell)
+    keys = list(grouped)
+    order = _sweep_order(keys)
+    members = [keys[i] for i in order]
+    classes = [sorted(grouped[keys[i]]) for i in order]
+    sizes = [len(cells) for cells in classes]
+    n, total = len(classes), sum(sizes)
+    dues = [remaining for _, remaining in constraints]
+
+    # Cases de chaque contrainte encore à affecter après la classe j
+    capacity = []
+    left = [len(cells) for cells, _ in constraints]
+    for j in range(n):
+        for q in members[j]:
+            left[q] -= sizes[j]
+        capacity.append({q: left[q] for q in members[j]})
+
+    def step(state, j, m):
+        """État (mines dues par contrainte ouverte) après m mines dans la classe j, None si incohérent."""
+        due = dict(state)
+        for q in members[j]:
+            rest = due.get(q, dues[q]) - m
+            if rest < 0 or rest > capacity[j][q]:
+                return None
+            if capacity[j][q]:
+                due[q] = rest
+            else:
+                due.pop(q, None)
+        return tuple(sorted(due.items()))
+
+    # Balayage avant : poids des préfixes par état, en gardant les transitions (état, m, état suivant)
+    forward = [{(): np.eye(1, total + 1)[0]}]
+    transitions = []
+    budget = MAX_STATES
+    for j in range(n):
+        layer, moves = {}, []
+        for state, poly in forward[j].items():
+            for m in range(sizes[j] + 1):
+                after = step(state, j, m)
+                if after is None:
+                    continue
+                if after not in layer:
+                    budget -= 1
+                    if budget < 0:
+                        return None
+                    layer[after] = np.zeros(total + 1)
+                _shift_add(layer[after], poly, m, comb(sizes[j], m))
+                moves.append((state, m, after))
+        forward.append(layer)
+        transitions.append(moves)
+    weights = forward[n].get(())
+    if weights is None:
+        return None
+
+    # Balayage arrière sur les mêmes transitions, puis espérance de chaque classe
+    backward = {(): np.eye(1, total + 1)[0]}
+    expected = [None] * n
+    for j in reversed(range(n)):
+        suffixes, mined = {}, {}
+        for state, m, after in transitions[j]:
+            if after not in backward:
+                continue
+            weight = comb(sizes[j], m)
+            _shift_add(suffixes.setdefault(state, np.zeros(total + 1)), backward[after], m, weight)
+            if m:
+                _shift_add(mined.setdefault(state, np.zeros(total + 1)), backward[after], m, weight * m)
+        expected[j] = sum((np.convolve(forward[j][state], suffix)[:total + 1] for state, suffix in mined.items()),
+                          np.zeros(total + 1))
+        backward = suffixes
+    return classes, weights, expected
+
+
+def _log_comb(n: int, k: int) -> float:
+    if k < 0 or k > n:
+        return -np.inf
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+def _fallback(constraints: List[Constraint]) -> Dict[Cell, float]:
+    """Estimation locale : pire densité des contraintes couvrant chaque case."""
+    probabilities = {}
+    for cells, remaining in constraints:
+        density = remaining / len(cells)
+        for cell in cells:
+            probabilities[cell] = max(probabilities.get(cell, 0.0), density)
+    return probabilities
+
+
+def mine_probabilities(constraints: List[Constraint], unconstrained: int,
+                       mines_left: Optional[int]) -> Tuple[Dict[Cell, float], float]:
+    """
+    Probabilité d'être une mine pour chaque case cachée de la frontière, et pour
+    une case cachée hors frontière. `mines_left` : mines non flaggées (None : inconnu).
+    """
+    frontier_cells = len({cell for cells, _ in constraints for cell in cells})
+    if mines_left is None:
+        mines_left = round((frontier_cells + unconstrained) * MINE_DENSITY)
+    uniform = min(max(mines_left / max(frontier_cells + unconstrained, 1), 0.0), 1.0)
+
+    solved, probabilities = [], {}
+    for component in components(constraints):
+        result = solve_component(frozenset(component))
+        if result is None:
+            probabilities.update(_fallback(component))
+        else:
+            classes, weights, expected = result
+            # Normalisation : les poids d'une grande composante dépassent vite les float
+            scale = weights.max()
+            solved.append((classes, weights / scale, [e / scale for e in expected]))
+
+    # Poids de chaque total K de mines sur la frontière exacte : C(hors frontière, mines restantes - K)
+    approximate = sum(probabilities.values())
+    totals = [np.ones(1)]
+    for _, weights, _ in solved:
+        total = np.convolve(totals[-1], weights)
+        totals.append(total / total.max())
+    size = len(totals[-1])
+    left = mines_left - approximate
+    log_f = np.array([_log_comb(unconstrained, round(left - K)) for K in range(size)])
+    if np.isfinite(log_f).any():
+        f = np.exp(log_f - log_f[np.isfinite(log_f)].max())
+    else:
+        f = np.ones(size)  # nombre de mines incohérent : composantes indépendantes
+    z = float(totals[-1] @ f)
+    if z <= 0:
+        f, z = np.ones(size), float(totals[-1].sum())
+
+    # Composante i : h[k] = poids du reste du plateau si elle a k mines. Les composantes
+    # après i sont absorbées dans f (corrélations courtes), celles avant sont dans totals[i]
+    absorbed = f
+    for i in reversed(range(len(solved))):
+        classes, weights, expected = solved[i]
+        h = np.correlate(absorbed, totals[i], "valid")
+        norm = float(weights @ h)
+        for cells, mines in zip(classes, expected):
+            # Aucun total compatible avec le reste du plateau (poids nuls) : densité uniforme
+            p = float(mines @ h) / (norm * len(cells)) if norm > 0 else uniform
+            for cell in cells:
+                probabilities[cell] = min(max(p, 0.0), 1.0)
+        absorbed = np.correlate(absorbed, weights, "valid")
+
+    outside = 0.0
+    if unconstrained:
+        mines_outside = float((totals[-1] * f) @ np.maximum(left - np.arange(size), 0))
+        outside = min(max(mines_outside / (z * unconstrained), 0.0), 1.0)
+    return probabilities, outside
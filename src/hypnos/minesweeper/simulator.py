@@ -0,0 +1,189 @@
+"""
+Offline minesweeper referee and benchmark.
+
+LocalSession stands in for the HTTP session of MinesweeperSmartSolver: it
+answers POST new-game, <game_id>/reveal and <game_id>/flag with the same
+payload as the API (game_id, rows, cols, game_over, won and the full list of
+cells, hidden values as None, plus the mine count), from a seeded board.
+Mines are placed at the first reveal, away from the revealed cell and its
+neighbors, and revealing a 0 opens its area like the real game.
+
+    python -m hypnos.minesweeper.simulator --games 50 --rows 16 --cols 30 --mines 99
+
+plays seeded games without network and reports win rate, time, requests
+and sequential round trips per game. --latency adds a simulated network
+delay to every request; requests are still applied one at a time, like a
+server handling a game. Here a game is won when every safe cell is revealed,
+flags or not: --no-flags measures the solver without its flag requests.
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from hypnos.minesweeper.solver import STAGES, MinesweeperSmartSolver, neighbor_sum
+
+
+class MinesweeperGame:
+    def __init__(self, rows: int = 16, cols: int = 16, mines: int = 40, seed: Optional[int] = None):
+        self.rows, self.cols, self.mine_count = rows, cols, mines
+        self.rng = np.random.default_rng(seed)
+        self.game_id = uuid.uuid4().hex
+        self.mines = np.zeros((rows, cols), dtype=bool)
+        self.counts = np.zeros((rows, cols), dtype=np.int16)
+        self.revealed = np.zeros((rows, cols), dtype=bool)
+        self.flagged = np.zeros((rows, cols), dtype=bool)
+        self.started = False
+        self.game_over = False
+        self.won = False
+
+    def _place_mines(self, row: int, col: int) -> None:
+        allowed = np.ones((self.rows, self.cols), dtype=bool)
+        allowed[max(row - 1, 0):row + 2, max(col - 1, 0):col + 2] = False
+        cells = np.flatnonzero(allowed)
+        chosen = self.rng.choice(cells, size=min(self.mine_count, len(cells)), replace=False)
+        self.mines.flat[chosen] = True
+        self.counts = neighbor_sum(self.mines)
+        self.started = True
+
+    def reveal(self, row: int, col: int) -> None:
+        if self.game_over or self.revealed[row, col] or self.flagged[row, col]:
+            return
+        if not self.started:
+            self._place_mines(row, col)
+        if self.mines[row, col]:
+            self.revealed[row, col] = True
+            self.game_over = True
+            return
+        # Ouverture en cascade depuis les cases à 0
+        stack = [(row, col)]
+        while stack:
+            r, c = stack.pop()
+            if self.revealed[r, c] or self.flagged[r, c]:
+                continue
+            self.revealed[r, c] = True
+            if self.counts[r, c] == 0:
+                for nr in range(max(r - 1, 0), min(r + 2, self.rows)):
+                    for nc in range(max(c - 1, 0), min(c + 2, self.cols)):
+                        if not self.revealed[nr, nc]:
+                            stack.append((nr, nc))
+        if np.count_nonzero(~self.revealed) == self.mine_count:
+            self.game_over = self.won = True
+
+    def flag(self, row: int, col: int) -> None:
+        if not self.game_over and not self.revealed[row, col]:
+            self.flagged[row, col] = not self.flagged[row, col]
+
+    def state(self) -> Dict:
+        rows, cols = np.indices((self.rows, self.cols))
+        cells = [
+            {"row": r, "col": c, "revealed": revealed, "flagged": flagged, "value": value if revealed else None}
+            for r, c, revealed, flagged, value in zip(rows.ravel().tolist(), cols.ravel().tolist(),
+                                                     self.revealed.ravel().tolist(), self.flagged.ravel().tolist(),
+                                                     self.counts.ravel().tolist())
+        ]
+        return {"game_id": self.game_id, "rows": self.rows, "cols": self.cols, "mines": self.mine_count,
+                "game_over": self.game_over, "won": self.won, "cells": cells}
+
+
+class LocalResponse:
+    def __init__(self, status_code: int, payload: Dict):
+        self.status_code = status_code
+        self.payload = payload
+
+    @property
+    def text(self) -> str:
+        return str(self.payload)
+
+    def json(self) -> Dict:
+        return self.payload
+
+
+class LocalSession:
+    """Session factice : une partie à la fois, nouvelle partie à chaque new-game."""
+
+    def __init__(self, rows: int = 16, cols: int = 16, mines: int = 40, seed: int = 0, latency: float = 0.0):
+        self.rows, self.cols, self.mines = rows, cols, mines
+        self.seed = seed
+        self.latency = latency
+        self.game: Optional[MinesweeperGame] = None
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def post(self, url: str, json: Optional[Dict] = None) -> LocalResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            return self._handle(url, json)
+
+    def _handle(self, url: str, json: Optional[Dict]) -> LocalResponse:
+        self.requests += 1
+        action = url.rstrip("/").split("/")[-1]
+        if action == "new-game":
+            self.game = MinesweeperGame(self.rows, self.cols, self.mines, self.seed)
+            self.seed += 1
+            return LocalResponse(200, self.game.state())
+        if self.game is None or f"/{self.game.game_id}/" not in url:
+            return LocalResponse(404, {"detail": "Game not found"})
+        if action == "reveal":
+            self.game.reveal(json["row"], json["col"])
+        elif action == "flag":
+            self.game.flag(json["row"], json["col"])
+        else:
+            return LocalResponse(404, {"detail": "Not found"})
+        return LocalResponse(200, self.game.state())
+
+
+def play_game(rows: int, cols: int, mines: int, seed: int, latency: float = 0.0, flag_mines: bool = True) -> Dict:
+    """Une partie du solveur sur le simulateur (sorties console masquées)."""
+    session = LocalSession(rows, cols, mines, seed, latency)
+    solver = MinesweeperSmartSolver(session=session, flag_mines=flag_mines)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        won = solver.play_game()
+    return {"seed": seed, "won": bool(won), "time": time.perf_counter() - started,
+            "requests": session.requests, "round_trips": solver.round_trips, "deductions": solver.deductions}
+
+
+def run_bench(games: int = 20, rows: int = 16, cols: int = 16, mines: int = 40, seed: int = 0,
+              latency: float = 0.0, flag_mines: bool = True) -> List[Dict]:
+    return [play_game(rows, cols, mines, s, latency, flag_mines) for s in range(seed, seed + games)]
+
+
+def print_report(results: List[Dict]) -> None:
+    wins = sum(r["won"] for r in results)
+    print(f"Games: {len(results)}, won {wins} ({wins / len(results):.0%})")
+    print(f"Time per game: mean {statistics.fmean(r['time'] for r in results) * 1000:.0f} ms, "
+          f"max {max(r['time'] for r in results) * 1000:.0f} ms")
+    print(f"Requests per game: mean {statistics.fmean(r['requests'] for r in results):.1f}, "
+          f"max {max(r['requests'] for r in results)}")
+    print(f"Round trips per game: mean {statistics.fmean(r['round_trips'] for r in results):.1f}, "
+          f"max {max(r['round_trips'] for r in results)}")
+    print("Moves per game by stage: " + ", ".join(
+        f"{stage} {statistics.fmean(r['deductions'][stage] for r in results):.1f}" for stage in STAGES))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline minesweeper solver benchmark")
+    parser.add_argument("--games", "-n", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=16)
+    parser.add_argument("--mines", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated network delay per request (ms)")
+    parser.add_argument("--no-flags", action="store_true", help="Mark mines locally without flag requests")
+    args = parser.parse_args()
+    print(f"Benchmarking {args.games} game(s) on {args.rows}x{args.cols} with {args.mines} mines, seed={args.seed}...")
+    print_report(run_bench(args.games, args.rows, args.cols, args.mines, args.seed, args.latency / 1000,
+                           not args.no_flags))
+
+
+if __name__ == "__main__":
+    main()
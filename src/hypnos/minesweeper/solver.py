@@ -1,46 +1,82 @@
-import os
-import requests
 import time
 import random
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
 
-# Charger les variables d'environnement
-load_dotenv()
+import numpy as np
+
+from hypnos.lib.session import get_cookies, get_session
+from hypnos.minesweeper.linear import forced_cells
+from hypnos.minesweeper.probability import mine_probabilities
 
 API_URL = "https://play.hypnos2026.fr/api/arg/minesweeper"
+# Étapes de résolution, dans l'ordre où elles sont essayées
+STAGES = ("trivial", "subset", "linear", "guess")
+# Requêtes envoyées en parallèle sur la session keep-alive (reveals sans cascade possible).
+# Hypothèses sur le serveur : il applique les coups d'une même partie un par un (pas de mise
+# à jour perdue), dans n'importe quel ordre. L'ordre est sans danger : chaque reveal d'une vague
+# est prouvé sûr et touche une mine connue (valeur >= 1), il n'ouvre donc que sa case, même
+# si ses voisins de la vague sont révélés avant ou après. Si une vague révèle plus que ses
+# cases, le solveur repasse en reveals séquentiels
+PIPELINE = 8
+
+def neighbor_sum(mask):
+    """Somme sur les 8 voisins de chaque case : convolution 3x3 sans le centre, bords à 0."""
+    rows, cols = mask.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.int16)
+    padded[1:-1, 1:-1] = mask
+    # Somme des 3 lignes puis des 3 colonnes (séparable), moins la case elle-même
+    band = padded[:-2] + padded[1:-1] + padded[2:]
+    return band[:, :-2] + band[:, 1:-1] + band[:, 2:] - padded[1:-1, 1:-1]
 
-class MinesweeperSmartSolver:
-    def __init__(self):
-        self.auth_token = os.getenv("AUTH_TOKEN")
-        self.csrf_token = os.getenv("CSRF_TOKEN")
-        
-        if not self.auth_token or not self.csrf_token:
-            print("❌ Erreur : AUTH_TOKEN ou CSRF_TOKEN manquants (.env)")
-            exit(1)
 
-        self.session = requests.Session()
-        self._configure_headers()
+def dilate(mask):
+    """Cases ayant au moins un voisin dans `mask`."""
+    return neighbor_sum(mask) > 0
+
+
+class MinesweeperSmartSolver:
+    def __init__(self, session=None, flag_mines=True):
+        # `session` : tout objet avec .post(url, json=...) -> réponse requests (ex : simulateur local)
+        # `flag_mines` : envoyer les flags des mines trouvées (une vague par lot). False : mines
+        # seulement marquées localement, à réserver à un serveur dont la victoire ne demande pas
+        # les flags (le simulateur local, par exemple)
+        self.flag_mines = flag_mines
+        if session is None:
+            cookies = get_cookies()
+            if not cookies['auth_token'] or not cookies['csrf_token']:
+                print("❌ Erreur : AUTH_TOKEN ou CSRF_TOKEN manquants (.env)")
+                exit(1)
+            session = get_session('https://play.hypnos2026.fr/game/minesweeper/', cookies)
+        self.session = session
 
-        # État du jeu
+        # État du jeu : une case par élément, value = nombre de mines voisines (0 si inconnue)
         self.game_id = None
         self.rows = 0
         self.cols = 0
-        self.grid = {}  # (r, c) -> dict
+        self.mines = None # Nombre total de mines, s'il est fourni par le serveur
+        self.values = np.zeros((0, 0), dtype=np.int8)
+        self.revealed = np.zeros((0, 0), dtype=bool)
+        self.flagged = np.zeros((0, 0), dtype=bool)
+        self.known_mines = np.zeros((0, 0), dtype=bool) # Mines déduites (flaggées ou non côté serveur)
+        # Position de chaque case dans la liste "cells" des réponses
+        self.index = np.full((0, 0), -1, dtype=np.intp)
+        # Cases de la dernière réponse, pas encore reportées dans les tableaux
+        self.pending = None
+        # Cases révélées ou flaggées depuis la dernière mise à jour de la frontière
+        self.dirty = np.zeros((0, 0), dtype=bool)
+        # Frontière : case révélée -> (voisins cachés, mines restant à y placer)
+        self.constraints = {}
+        # Index inverse : case cachée -> cases de la frontière qui la contraignent
+        self.constrained_by = {}
+        # Coups trouvés par chaque étape sur la partie en cours
+        self.deductions = dict.fromkeys(STAGES, 0)
+        # Requêtes de la partie, et allers-retours séquentiels (une vague parallèle compte pour un)
+        self.requests = 0
+        self.round_trips = 0
+        # Vagues parallèles de reveals, désactivées dès qu'une réponse sort des cases demandées
+        self.waves = True
         self.game_over = False
         self.won = False
-        self.mines_remaining_counter = 0
-
-    def _configure_headers(self):
-        self.session.headers.update({
-            'accept': 'application/json',
-            'content-type': 'application/json',
-            'origin': 'https://play.hypnos2026.fr',
-            'referer': 'https://play.hypnos2026.fr/game/minesweeper/',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/143.0.0.0 Safari/537.36',
-            'x-csrf-token': self.csrf_token
-        })
-        self.session.cookies.set('auth_token', self.auth_token)
-        self.session.cookies.set('csrf_token', self.csrf_token)
 
     def _api_call(self, endpoint, payload=None):
         """Wrapper générique pour les appels API"""
@@ -58,124 +94,179 @@ class MinesweeperSmartSolver:
             print(f"⚠️ Exception API {endpoint}: {e}")
         return None
 
+    def reset(self, rows, cols):
+        self.rows, self.cols = rows, cols
+        self.values = np.zeros((rows, cols), dtype=np.int8)
+        self.revealed = np.zeros((rows, cols), dtype=bool)
+        self.flagged = np.zeros((rows, cols), dtype=bool)
+        self.known_mines = np.zeros((rows, cols), dtype=bool)
+        self.index = np.full((rows, cols), -1, dtype=np.intp)
+        self.pending = None
+        self.dirty = np.zeros((rows, cols), dtype=bool)
+        self.constraints = {}
+        self.constrained_by = {}
+        self.deductions = dict.fromkeys(STAGES, 0)
+        self.requests = 0
+        self.round_trips = 0
+
     def update_grid(self, data):
         """Met à jour la grille locale avec les données du serveur"""
         if not data: return
         self.game_id = data.get("game_id", self.game_id)
-        self.rows = data.get("rows", self.rows)
-        self.cols = data.get("cols", self.cols)
+        rows, cols = data.get("rows", self.rows), data.get("cols", self.cols)
+        if (rows, cols) != self.values.shape:
+            self.reset(rows, cols)
+        self.mines = data.get("mines", self.mines)
         self.game_over = data.get("game_over", False)
         self.won = data.get("won", False)
-        
-        # Mise à jour des cellules
-        for cell in data.get("cells", []):
-            self.grid[(cell['row'], cell['col'])] = cell
-
-    def get_neighbors(self, r, c):
-        """Récupère les coordonnées des voisins"""
-        nbs = []
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0: continue
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                    nbs.append((nr, nc))
-        return nbs
-
-    def get_cell_info(self, r, c):
-        """Retourne (valeur, [voisins_flagged], [voisins_hidden])"""
-        cell = self.grid.get((r, c))
-        if not cell: return None, [], []
-        
-        nbs = self.get_neighbors(r, c)
-        flagged = []
-        hidden = []
-        
-        for nr, nc in nbs:
-            n_cell = self.grid.get((nr, nc))
-            if not n_cell: continue # Ne devrait pas arriver si la grille est init
-            if n_cell['flagged']:
-                flagged.append((nr, nc))
-            elif not n_cell['revealed']:
-                hidden.append((nr, nc))
-                
-        return cell['value'], flagged, hidden
+
+        # Chaque réponse contient toute la grille : on ne la convertit qu'au besoin (sync)
+        if data.get("cells"):
+            self.pending = data["cells"]
+
+    def sync(self):
+        """Reporte les cases de la dernière réponse dans les tableaux NumPy."""
+        cells, self.pending = self.pending, None
+        if not cells: return
+        n = len(cells)
+        r = np.fromiter([cell['row'] for cell in cells], dtype=np.intp, count=n)
+        c = np.fromiter([cell['col'] for cell in cells], dtype=np.intp, count=n)
+        revealed, flagged = self.revealed.copy(), self.flagged.copy()
+        self.values[r, c] = [cell['value'] or 0 for cell in cells]
+        self.revealed[r, c] = [cell['revealed'] for cell in cells]
+        self.flagged[r, c] = [cell['flagged'] for cell in cells]
+        self.index[r, c] = np.arange(n)
+        self.dirty |= (self.revealed != revealed) | (self.flagged != flagged)
+
+    def cell_state(self, r, c):
+        """(revealed, flagged) de (r, c) selon la dernière réponse, sans convertir toute la grille"""
+        if self.pending:
+            i = self.index[r, c]
+            cell = self.pending[i] if 0 <= i < len(self.pending) else None
+            if cell and cell['row'] == r and cell['col'] == c:
+                return cell['revealed'], cell['flagged']
+            self.sync()
+        return self.revealed[r, c], self.flagged[r, c]
+
+    @property
+    def marked(self):
+        """Mines connues : flaggées sur le serveur ou déduites localement"""
+        return self.flagged | self.known_mines
+
+    @property
+    def hidden(self):
+        return ~self.revealed & ~self.marked
+
+    def hidden_neighbors(self, r, c, hidden=None):
+        """Coordonnées des voisins cachés (ni révélés ni flaggés) de (r, c)"""
+        hidden = self.hidden if hidden is None else hidden
+        r0, c0 = max(r - 1, 0), max(c - 1, 0)
+        window = hidden[r0:r + 2, c0:c + 2]
+        return frozenset((r0 + dr, c0 + dc) for dr, dc in zip(*np.nonzero(window)))
+
+    def update_frontier(self, hidden, remaining):
+        """Re-dérive les contraintes des seules cases révélées autour des cases modifiées (dirty)."""
+        if not self.dirty.any(): return
+        around = (self.dirty | dilate(self.dirty)) & self.revealed
+        self.dirty[:] = False
+        for key in zip(*(axis.tolist() for axis in np.nonzero(around))):
+            old = self.constraints.pop(key, None)
+            if old:
+                for cell in old[0]:
+                    owners = self.constrained_by[cell]
+                    owners.discard(key)
+                    if not owners: del self.constrained_by[cell]
+            cells = self.hidden_neighbors(*key, hidden) if self.values[key] > 0 else None
+            if cells:
+                self.constraints[key] = (cells, int(remaining[key]))
+                for cell in cells:
+                    self.constrained_by.setdefault(cell, set()).add(key)
 
     def action_reveal(self, r, c):
         print(f"🔍 Reveal ({r}, {c})")
+        self.requests += 1
+        self.round_trips += 1
         data = self._api_call(f"{self.game_id}/reveal", {"row": r, "col": c})
         if data: self.update_grid(data)
         return bool(data)
 
     def action_flag(self, r, c):
         print(f"🚩 Flag ({r}, {c})")
+        self.requests += 1
+        self.round_trips += 1
         data = self._api_call(f"{self.game_id}/flag", {"row": r, "col": c})
         if data: self.update_grid(data)
         return bool(data)
 
+    def mark_mine(self, r, c):
+        self.known_mines[r, c] = True
+        self.dirty[r, c] = True
+
+    def send_wave(self, actions):
+        """
+        Envoie en parallèle des coups indépendants [(action, r, c)] sur la session keep-alive.
+        Les réponses arrivent dans le désordre : on garde celle qui a le plus de cases révélées
+        (le serveur les a traitées l'une après l'autre, la dernière contient toutes les autres).
+        Si elle révèle des cases hors de la vague, les reveals repassent en séquentiel (self.waves).
+        """
+        print(f"📦 Vague de {len(actions)} coup(s) en parallèle")
+        self.sync()
+        requested = {(r, c) for action, r, c in actions if action == 'reveal'}
+        self.requests += len(actions)
+        self.round_trips += 1
+        with ThreadPoolExecutor(max_workers=PIPELINE) as pool:
+            responses = list(pool.map(
+                lambda move: self._api_call(f"{self.game_id}/{move[0]}", {"row": move[1], "col": move[2]}),
+                actions))
+        responses = [data for data in responses if data]
+        if not responses: return False
+        data = max(responses, key=lambda data: (
+            data.get("game_over", False), sum(cell['revealed'] for cell in data.get("cells", []))))
+        if requested and not data.get("game_over", False) and any(
+                cell['revealed'] and not self.revealed[cell['row'], cell['col']]
+                and (cell['row'], cell['col']) not in requested for cell in data.get("cells", [])):
+            print("⚠️ La vague a révélé d'autres cases : reveals séquentiels désormais")
+            self.waves = False
+        self.update_grid(data)
+        return True
+
     def solve_step(self):
         """Une itération de résolution"""
         moves = set() # Pour éviter les doublons dans une passe
-        
+        self.sync()
+        hidden = self.hidden
+        hidden_count = neighbor_sum(hidden)
+        # Mines restant à placer autour de chaque case révélée
+        remaining = self.values - neighbor_sum(self.marked)
+
         # 1. Identifier la "frontière" : cases révélées avec >0 voisins cachés
-        frontier = []
-        for coords, cell in self.grid.items():
-            if cell['revealed'] and cell['value'] and cell['value'] > 0:
-                _, _, hidden = self.get_cell_info(cell['row'], cell['col'])
-                if hidden:
-                    frontier.append(coords)
-
-        if not frontier:
+        frontier = self.revealed & (self.values > 0) & (hidden_count > 0)
+        if not frontier.any():
             return False
 
         # --- ÉTAPE 1 : Logique Triviale ---
         # Si Flagged == Value -> Reste Safe
         # Si Hidden + Flagged == Value -> Reste Mines
-        for r, c in frontier:
-            val, flagged, hidden = self.get_cell_info(r, c)
-            
-            # Tout le reste est safe
-            if len(flagged) == val:
-                for hr, hc in hidden:
-                    moves.add(('reveal', hr, hc))
-            
-            # Tout le reste est des mines
-            elif len(hidden) + len(flagged) == val:
-                for hr, hc in hidden:
-                    moves.add(('flag', hr, hc))
+        safe = dilate(frontier & (remaining == 0)) & hidden
+        mines = dilate(frontier & (remaining == hidden_count) & (remaining > 0)) & hidden
+        moves.update(('reveal', r, c) for r, c in zip(*np.nonzero(safe)))
+        moves.update(('flag', r, c) for r, c in zip(*np.nonzero(mines & ~safe)))
 
         if moves:
+            self.deductions["trivial"] += len(moves)
             return self.execute_batch(moves)
 
         # --- ÉTAPE 2 : Logique des Ensembles (Subsets) ---
-        # Comparer deux cases de la frontière qui partagent des voisins
+        # Comparer deux cases de la frontière qui partagent des voisins cachés
         # Si Voisins(A) est sous-ensemble de Voisins(B), on peut déduire des infos sur B-A
-        
-        # On limite la recherche pour la performance (voisins de voisins)
-        processed_pairs = set()
-        
-        for r1, c1 in frontier:
-            val1, flag1, hidden1 = self.get_cell_info(r1, c1)
-            eff_val1 = val1 - len(flag1) # Mines restantes à trouver
-            set1 = set(hidden1)
-            
-            # Chercher des voisins dans la frontière
-            neighbors_of_1 = self.get_neighbors(r1, c1)
-            frontier_neighbors = [n for n in neighbors_of_1 if n in frontier] # Optimisation
-            
-            for r2, c2 in frontier: # Comparaison bruteforce sur la frontière (peut être optimisé par proximité)
-                if (r1, c1) == (r2, c2): continue
-                
-                # Optimisation: ne comparer que si proches (distance < 3 cases)
-                if abs(r1-r2) > 2 or abs(c1-c2) > 2: continue
-
-                pair_sig = tuple(sorted(((r1,c1), (r2,c2))))
-                if pair_sig in processed_pairs: continue
-                processed_pairs.add(pair_sig)
+        self.update_frontier(hidden, remaining)
 
-                val2, flag2, hidden2 = self.get_cell_info(r2, c2)
-                eff_val2 = val2 - len(flag2)
-                set2 = set(hidden2)
+        for (r1, c1), (set1, eff_val1) in self.constraints.items():
+            # Seules les contraintes partageant une case cachée avec (r1, c1), chaque paire une fois
+            others = set().union(*(self.constrained_by[cell] for cell in set1))
+            for r2, c2 in others:
+                if (r2, c2) <= (r1, c1): continue
+                set2, eff_val2 = self.constraints[(r2, c2)]
 
                 # Cas A: Set1 est un sous-ensemble de Set2
                 if set1.issubset(set2):
@@ -207,80 +298,124 @@ class MinesweeperSmartSolver:
                             for dr, dc in diff: moves.add(('flag', dr, dc))
 
         if moves:
+            self.deductions["subset"] += len(moves)
+            return self.execute_batch(moves)
+
+        # --- ÉTAPE 3 : Élimination de Gauss sur la frontière ---
+        # Combinaisons linéaires de toutes les contraintes d'une composante, bornes 0/1 des cases
+        safe, mines = forced_cells(list(self.constraints.values()))
+        moves.update(('reveal', r, c) for r, c in safe)
+        moves.update(('flag', r, c) for r, c in mines - safe)
+
+        if moves:
+            print(f"🧮 Logique Linéaire: {len(safe)} safe, {len(mines)} mine(s)")
+            self.deductions["linear"] += len(moves)
             return self.execute_batch(moves)
             
         return False
 
     def execute_batch(self, moves):
-        """Exécute les mouvements trouvés. S'arrête si Game Over."""
+        """
+        Exécute les coups trouvés. Les mines sont marquées localement, puis flaggées sur le
+        serveur en fin de lot (sauf flag_mines=False). Les reveals pouvant cascader passent un par un, celui qui couvre le plus
+        d'autres reveals en attente d'abord, et ceux déjà ouverts par une cascade sont sautés ;
+        les reveals voisins d'une mine connue ou flaggée (valeur >= 1, pas de cascade) partent
+        en une vague, sauf si les vagues ont été désactivées (self.waves).
+        """
         did_something = False
-        # On trie pour prioriser les reveals (donnent de l'info)
-        sorted_moves = sorted(list(moves), key=lambda x: x[0], reverse=True) 
-        
-        for action, r, c in sorted_moves:
-            if self.game_over: break
-            
-            # Vérifier que l'état n'a pas changé entre temps (ex: déjà révélé)
-            cell = self.grid.get((r, c))
-            if not cell: continue
-            if action == 'reveal' and cell['revealed']: continue
-            if action == 'flag' and cell['flagged']: continue
-            
-            if action == 'reveal':
-                self.action_reveal(r, c)
-            else:
-                self.action_flag(r, c)
+        flags = []
+        for action, r, c in moves:
+            if action == 'flag' and not self.known_mines[r, c]:
+                self.mark_mine(r, c)
+                flags.append(('flag', r, c))
+                did_something = True
+
+        pending = {(r, c) for action, r, c in moves if action == 'reveal'}
+        while pending and not self.game_over:
+            # Vérifier que l'état n'a pas changé entre temps (ex: déjà révélé par une cascade)
+            pending = {cell for cell in pending if not any(self.cell_state(*cell))}
+            if not pending: break
+            marked = self.marked
+            isolated = {(r, c) for r, c in pending
+                        if marked[max(r - 1, 0):r + 2, max(c - 1, 0):c + 2].any()}
+            cascading = pending - isolated
+            if not cascading and self.waves:
+                did_something = self.send_wave([('reveal', r, c) for r, c in sorted(isolated)]) or did_something
+                break
+            r, c = max(cascading or pending, key=lambda cell: (sum((cell[0] + dr, cell[1] + dc) in pending
+                                                        for dr in (-1, 0, 1) for dc in (-1, 0, 1)), cell))
+            self.action_reveal(r, c)
+            pending.discard((r, c))
             did_something = True
-            
+
+        if self.flag_mines and flags and not self.game_over:
+            self.send_wave(flags)
         return did_something
 
     def guess(self):
-        """Devinette : préférer les coins ou aléatoire"""
-        hidden = [k for k, v in self.grid.items() if not v['revealed'] and not v['flagged']]
-        if not hidden: return False
+        """Devinette : la case cachée la moins probablement minée (coins d'abord hors frontière)"""
+        self.sync()
+        hidden_mask = self.hidden
+        if not hidden_mask.any(): return False
+        self.update_frontier(hidden_mask, self.values - neighbor_sum(self.marked))
+
+        unconstrained = int(np.count_nonzero(hidden_mask)) - len(self.constrained_by)
+        mines_left = self.mines - int(np.count_nonzero(self.marked)) if self.mines is not None else None
+        probabilities, outside = mine_probabilities(list(self.constraints.values()), unconstrained, mines_left)
+        best = min(probabilities, key=probabilities.get, default=None)
+
+        if best is not None and (not unconstrained or probabilities[best] <= outside):
+            choice, p = best, probabilities[best]
+            print(f"🎲 Guess (Frontière, p={p:.2f}): {choice}")
+        else:
+            # Hors frontière toutes les cases se valent : les coins ouvrent plus souvent une zone
+            free = hidden_mask.copy()
+            for r, c in self.constrained_by: free[r, c] = False
+            corners = [(0,0), (0, self.cols-1), (self.rows-1, 0), (self.rows-1, self.cols-1)]
+            valid_corners = [c for c in corners if free[c]]
+            choice = random.choice(valid_corners) if valid_corners else random.choice(list(zip(*np.nonzero(free))))
+            print(f"🎲 Guess (Hors frontière, p={outside:.2f}): {choice}")
+
+        self.deductions["guess"] += 1
+        return self.action_reveal(int(choice[0]), int(choice[1]))
+
+    def play_game(self):
+        """Joue une partie complète. True/False = gagnée/perdue, None si elle n'a pas pu démarrer."""
+        data = self._api_call("new-game", {})
+        if not data:
+            return None
+        
+        self.reset(data.get("rows", 0), data.get("cols", 0))
+        self.requests = self.round_trips = 1
+        self.update_grid(data)
+        print(f"🎮 Partie {self.game_id} ({self.rows}x{self.cols})")
         
-        # Priorité aux coins si non révélés (souvent plus sûrs ou ouvrent le jeu)
-        corners = [(0,0), (0, self.cols-1), (self.rows-1, 0), (self.rows-1, self.cols-1)]
-        valid_corners = [c for c in corners if c in self.grid and not self.grid[c]['revealed']]
+        # Premier coup au centre
+        mid_r, mid_c = self.rows // 2, self.cols // 2
+        self.action_reveal(mid_r, mid_c)
+
+        # Boucle de résolution
+        while not self.game_over:
+            if not self.solve_step():
+                print("🤔 Bloqué. Tentative de guess...")
+                if not self.guess():
+                    break # Plus rien à faire
         
-        if valid_corners:
-            choice = random.choice(valid_corners)
-            print(f"🎲 Guess (Corner): {choice}")
+        if self.won:
+            print("🏆 VICTOIRE !")
         else:
-            choice = random.choice(hidden)
-            print(f"🎲 Guess (Random): {choice}")
-            
-        return self.action_reveal(choice[0], choice[1])
+            print("💥 PERDU")
+        print("📊 Coups par étape : " + ", ".join(f"{stage} {n}" for stage, n in self.deductions.items()))
+        print(f"📡 {self.requests} requête(s), {self.round_trips} aller(s)-retour(s)")
+        return self.won
 
     def start(self):
         print("🚀 Démarrage du solver intelligent...")
         while True:
             # Nouvelle partie
-            data = self._api_call("new-game", {})
-            if not data:
+            if self.play_game() is None:
                 time.sleep(5)
                 continue
-            
-            self.grid = {}
-            self.update_grid(data)
-            print(f"🎮 Partie {self.game_id} ({self.rows}x{self.cols})")
-            
-            # Premier coup au centre
-            mid_r, mid_c = self.rows // 2, self.cols // 2
-            self.action_reveal(mid_r, mid_c)
-
-            # Boucle de résolution
-            while not self.game_over:
-                if not self.solve_step():
-                    print("🤔 Bloqué. Tentative de guess...")
-                    if not self.guess():
-                        break # Plus rien à faire
-            
-            if self.won:
-                print("🏆 VICTOIRE !")
-            else:
-                print("💥 PERDU")
-            
             time.sleep(2)
 
 if __name__ == "__main__":
@@ -288,4 +423,6 @@ if __name__ == "__main__":
     try:
         solver.start()
     except KeyboardInterrupt:
-        print("\n🛑 Arrêt demandé.")
\ No newline at end of file
+        print("\n🛑 Arrêt demandé.")
+    finally:
+        solver.session.log_metrics()
\ No newline at end of file
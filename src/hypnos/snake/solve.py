@@ -1,5 +1,4 @@
-import requests
-from hypnos.lib.session import get_cookies, get_headers
+from hypnos.lib.session import get_session
 from hypnos.lib import setup_logger
 from hypnos.snake.models import SnakePayload
 
@@ -12,8 +11,7 @@ DATA_PATH = resources.files("hypnos.snake.data")
 PAYLOAD_FILE = DATA_PATH / "payload.json"
 
 def main() -> None:
-    cookies = get_cookies()
-    headers = get_headers('https://play.hypnos2026.fr/game/snake/', cookies['csrf_token'])
+    session = get_session('https://play.hypnos2026.fr/game/snake/')
 
     # Charger le payload depuis le fichier
     if PAYLOAD_FILE.exists():
@@ -33,10 +31,8 @@ def main() -> None:
     logger.info(f"Envoi unique d'une requête avec score={json_data['score']}...")
 
     try:
-        response = requests.post(
+        response = session.post(
             'https://play.hypnos2026.fr/api/arg/challenges/1366125470/submit',
-            cookies=cookies,
-            headers=headers,
             json=json_data,
         )
 
@@ -53,7 +53,8 @@ def solve_theme(theme_slug: str) -> None:
         return
 
     logger.info(f"\n--- Solving Trivia Theme: {theme_slug} ---")
-    session = get_session('https://play.hypnos2026.fr/game/sporcle/')
+    # Une connexion keep-alive par thread d'envoi
+    session = get_session('https://play.hypnos2026.fr/game/sporcle/', pool_size=20)
     
     try:
         response = session.post('https://play.hypnos2026.fr/api/arg/sporcle/new-game', json={'theme_slug': theme_slug})
@@ -70,6 +71,7 @@ def solve_theme(theme_slug: str) -> None:
             for word in words:
                 executor.submit(send_guess, session, game_id, word)
                 time.sleep(0.02)
+        session.log_metrics()
     except Exception as e:
          logger.exception(f"Exception during solve_theme: {e}")
 
@@ -0,0 +1,116 @@
+"""
+Headless self-play benchmark for the 2048 solver.
+
+Plays N seeded games on the offline simulator, spread over a process pool
+(one game per task), and reports throughput, move latency, score
+distribution and max-tile rates. No network, no token, no msvcrt: every
+search change can be measured locally and compared run to run with --seed.
+"""
+
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from hypnos.twothousandfortyeight import solve
+from hypnos.twothousandfortyeight.simulator import Game2048
+from hypnos.twothousandfortyeight.transposition import TranspositionTable
+
+REPORTED_TILES = (256, 512, 1024, 2048, 4096, 8192)
+
+
+def play_game(seed: int, budget_ms: Optional[float] = None, max_moves: Optional[int] = None,
+              prob_threshold: Optional[float] = None, evaluator: Optional[str] = None) -> Dict:
+    """Joue une partie complète avec get_best_move et retourne ses statistiques."""
+    if evaluator is not None and evaluator != solve.EVALUATOR:
+        solve.set_evaluator(evaluator)
+    game = Game2048(seed)
+    table = TranspositionTable()
+    time_budget = budget_ms / 1000 if budget_ms else None
+    latencies: List[float] = []
+    nodes_before = solve.nodes_searched
+
+    while max_moves is None or game.moves < max_moves:
+        started = time.perf_counter()
+        direction = solve.get_best_move(game.board, table=table, prob_threshold=prob_threshold,
+                                        time_budget=time_budget)
+        latencies.append(time.perf_counter() - started)
+        if direction is None:
+            break
+        game.move(direction)
+
+    return {
+        "seed": seed,
+        "score": game.score,
+        "max_tile": game.max_tile(),
+        "moves": game.moves,
+        "latencies": latencies,
+        "nodes": solve.nodes_searched - nodes_before,
+    }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(results: List[Dict], wall_time: float) -> Dict:
+    latencies = [lat for r in results for lat in r["latencies"]]
+    think_time = sum(latencies)
+    moves = sum(r["moves"] for r in results)
+    nodes = sum(r["nodes"] for r in results)
+    scores = [r["score"] for r in results]
+    return {
+        "games": len(results),
+        "wall_time": wall_time,
+        "moves": moves,
+        "moves_per_sec": moves / think_time if think_time else 0.0,
+        "nodes_per_sec": nodes / think_time if think_time else 0.0,
+        "latency_p50_ms": _percentile(latencies, 50) * 1000,
+        "latency_p99_ms": _percentile(latencies, 99) * 1000,
+        "latency_max_ms": max(latencies, default=0.0) * 1000,
+        "score_min": min(scores, default=0),
+        "score_median": statistics.median(scores) if scores else 0,
+        "score_mean": statistics.fmean(scores) if scores else 0.0,
+        "score_max": max(scores, default=0),
+        "tile_rates": {
+            tile: sum(r["max_tile"] >= tile for r in results) / len(results)
+            for tile in REPORTED_TILES
+        } if results else {},
+    }
+
+
+def run_bench(games: int = 8, seed: int = 0, workers: int = 0, budget_ms: Optional[float] = None,
+              max_moves: Optional[int] = None, prob_threshold: Optional[float] = None,
+              evaluator: str = "heuristic") -> Dict:
+    """Joue `games` parties (graines seed, seed+1, ...) sur `workers` processus (0 = en série)."""
+    seeds = list(range(seed, seed + games))
+    args = [(s, budget_ms, max_moves, prob_threshold, evaluator) for s in seeds]
+    started = time.perf_counter()
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(play_game, *zip(*args)))
+    else:
+        results = [play_game(*a) for a in args]
+    return summarize(results, time.perf_counter() - started)
+
+
+def print_report(report: Dict) -> None:
+    print(f"Games: {report['games']} in {report['wall_time']:.1f}s ({report['moves']} moves)")
+    print(f"Throughput: {report['moves_per_sec']:.1f} moves/s, {report['nodes_per_sec']:,.0f} nodes/s")
+    print(f"Move latency: p50 {report['latency_p50_ms']:.1f} ms, "
+          f"p99 {report['latency_p99_ms']:.1f} ms, max {report['latency_max_ms']:.1f} ms")
+    print(f"Score: min {report['score_min']}, median {report['score_median']}, "
+          f"mean {report['score_mean']:.0f}, max {report['score_max']}")
+    rates = ", ".join(f"{tile}: {rate:.0%}" for tile, rate in report["tile_rates"].items())
+    print(f"Max tile reached: {rates}")
+
+
+def main(games: int = 8, seed: int = 0, workers: int = 0, budget_ms: Optional[float] = None,
+         max_moves: Optional[int] = None, evaluator: str = "heuristic") -> None:
+    print(f"Benchmarking {games} game(s), seed={seed}, workers={workers or 1}, evaluator={evaluator}, "
+          f"budget={f'{budget_ms} ms' if budget_ms else 'depth ladder'}...")
+    print_report(run_bench(games, seed, workers, budget_ms, max_moves, evaluator=evaluator))
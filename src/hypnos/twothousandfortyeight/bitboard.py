@@ -0,0 +1,171 @@
+"""
+Bitboard 2048 engine: the whole board packed in a 64-bit integer.
+
+Each cell is a 4-bit nibble holding the tile exponent (0 = empty, 1 = 2,
+2 = 4, ..., 15 = 32768). Cell (r, c) lives at bit 4 * (4 * r + c), so row 0
+is the low 16 bits and column 0 is the low nibble of each row.
+
+Moves are table lookups: every possible 16-bit row is precomputed once
+(65 536 entries) for left/right moves, and up/down go through a bit-twiddling
+transpose. No list is allocated while simulating a move.
+"""
+
+from typing import List
+
+ROW_MASK = 0xFFFF
+
+
+def _reverse_row(row: int) -> int:
+    return ((row >> 12) & 0xF) | ((row >> 4) & 0xF0) | ((row << 4) & 0xF00) | ((row << 12) & 0xF000)
+
+
+def _unpack_col(row: int) -> int:
+    """Spreads the 4 nibbles of a row over a column (bits 0, 16, 32, 48)."""
+    return (row & 0xF) | ((row & 0xF0) << 12) | ((row & 0xF00) << 24) | ((row & 0xF000) << 36)
+
+
+def _build_tables():
+    row_left = [0] * 65536
+    row_right = [0] * 65536
+    col_up = [0] * 65536
+    col_down = [0] * 65536
+    row_score = [0] * 65536
+
+    for row in range(65536):
+        tiles = [(row >> (4 * i)) & 0xF for i in range(4)]
+
+        # Fusion vers la gauche (même règle que l'ancien merge_row)
+        packed = [t for t in tiles if t != 0]
+        merged = []
+        gained = 0
+        i = 0
+        while i < len(packed):
+            if i + 1 < len(packed) and packed[i] == packed[i + 1]:
+                merged.append(min(packed[i] + 1, 15))
+                gained += 1 << (packed[i] + 1)
+                i += 2
+            else:
+                merged.append(packed[i])
+                i += 1
+
+        result = 0
+        for i, t in enumerate(merged):
+            result |= t << (4 * i)
+
+        rev_row = _reverse_row(row)
+        rev_result = _reverse_row(result)
+
+        row_left[row] = result
+        row_right[rev_row] = rev_result
+        col_up[row] = _unpack_col(result)
+        col_down[rev_row] = _unpack_col(rev_result)
+        # Les fusions d'une ligne rapportent autant dans les deux sens
+        row_score[row] = gained
+
+    return row_left, row_right, col_up, col_down, row_score
+
+
+ROW_LEFT, ROW_RIGHT, COL_UP, COL_DOWN, ROW_SCORE = _build_tables()
+
+
+def transpose(board: int) -> int:
+    """Transpose 4x4 par permutation de bits (aucune allocation)."""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def move_left(board: int) -> int:
+    return (ROW_LEFT[board & ROW_MASK]
+            | (ROW_LEFT[(board >> 16) & ROW_MASK] << 16)
+            | (ROW_LEFT[(board >> 32) & ROW_MASK] << 32)
+            | (ROW_LEFT[(board >> 48) & ROW_MASK] << 48))
+
+
+def move_right(board: int) -> int:
+    return (ROW_RIGHT[board & ROW_MASK]
+            | (ROW_RIGHT[(board >> 16) & ROW_MASK] << 16)
+            | (ROW_RIGHT[(board >> 32) & ROW_MASK] << 32)
+            | (ROW_RIGHT[(board >> 48) & ROW_MASK] << 48))
+
+
+def move_up(board: int) -> int:
+    t = transpose(board)
+    return (COL_UP[t & ROW_MASK]
+            | (COL_UP[(t >> 16) & ROW_MASK] << 4)
+            | (COL_UP[(t >> 32) & ROW_MASK] << 8)
+            | (COL_UP[(t >> 48) & ROW_MASK] << 12))
+
+
+def move_down(board: int) -> int:
+    t = transpose(board)
+    return (COL_DOWN[t & ROW_MASK]
+            | (COL_DOWN[(t >> 16) & ROW_MASK] << 4)
+            | (COL_DOWN[(t >> 32) & ROW_MASK] << 8)
+            | (COL_DOWN[(t >> 48) & ROW_MASK] << 12))
+
+
+MOVES = {
+    'up': move_up,
+    'down': move_down,
+    'left': move_left,
+    'right': move_right
+}
+
+
+def move_score(board: int, direction: str) -> int:
+    """Points gagnés (somme des tuiles créées par fusion) en jouant `direction`."""
+    if direction in ('up', 'down'):
+        board = transpose(board)
+    return (ROW_SCORE[board & ROW_MASK] + ROW_SCORE[(board >> 16) & ROW_MASK]
+            + ROW_SCORE[(board >> 32) & ROW_MASK] + ROW_SCORE[(board >> 48) & ROW_MASK])
+
+
+def to_bitboard(board: List[List[int]]) -> int:
+    """Convertit une grille API (valeurs 0, 2, 4, ...) en bitboard."""
+    packed = 0
+    for r in range(4):
+        for c in range(4):
+            val = board[r][c]
+            if val:
+                packed |= min(val.bit_length() - 1, 15) << (4 * (4 * r + c))
+    return packed
+
+
+def from_bitboard(packed: int) -> List[List[int]]:
+    """Convertit un bitboard en grille de valeurs (format API)."""
+    board = []
+    for r in range(4):
+        row = []
+        for c in range(4):
+            exp = (packed >> (4 * (4 * r + c))) & 0xF
+            row.append(1 << exp if exp else 0)
+        board.append(row)
+    return board
+
+
+def empty_cells(packed: int) -> List[int]:
+    """Retourne les décalages (en bits) des cases vides."""
+    return [shift for shift in range(0, 64, 4) if not (packed >> shift) & 0xF]
+
+
+def count_empty(packed: int) -> int:
+    count = 0
+    for shift in range(0, 64, 4):
+        if not (packed >> shift) & 0xF:
+            count += 1
+    return count
+
+
+def max_exponent(packed: int) -> int:
+    best = 0
+    for shift in range(0, 64, 4):
+        exp = (packed >> shift) & 0xF
+        if exp > best:
+            best = exp
+    return best
@@ -0,0 +1,195 @@
+"""
+Heuristic evaluation of 2048 bitboards.
+
+Every term of the heuristic is additive per row or per column, so it is
+precomputed once for the 65 536 possible 16-bit lines (vectorized NumPy):
+
+- snake weights (position-dependent) and empty cells,
+- monotonicity and merge potential (same terms for the 4 rows and 4 columns).
+
+Row tables hold the position terms plus the line terms of that row, the
+column table holds the line terms alone. `evaluate_board` scores one
+bitboard with 4 (or 8) list lookups, and
+`evaluate_boards` scores a whole batch of leaves (packed uint64 or (N, 4, 4)
+tile values) with the same tables through NumPy fancy indexing. Both add the
+terms in the same order and return bit-identical floats.
+
+The weights default to the hand-written values below and are replaced at
+import time by data/weights.json when it exists (written by `hypnos 2048 tune`).
+"""
+
+import json
+from importlib import resources
+from typing import Dict, List
+
+import numpy as np
+
+from hypnos.twothousandfortyeight.bitboard import ROW_MASK, transpose
+
+# Snake Pattern: Force les grosses tuiles vers le bas-droite (3,3)
+# Note: Ton 1024 est en bas à gauche actuellement, mais l'IA devrait s'adapter grâce à la profondeur.
+SNAKE_WEIGHTS = [
+    [2,   3,  4,  5],
+    [9,   8,  7,  6],
+    [10, 11, 12, 13],
+    [20, 19, 18, 17]
+]
+SNAKE_BASE = 4
+EXP_WEIGHTS = [[SNAKE_BASE**val for val in row] for row in SNAKE_WEIGHTS]
+
+DATA_PATH = resources.files("hypnos.twothousandfortyeight.data")
+WEIGHTS_FILE = DATA_PATH / "weights.json"
+
+# Bonus vital pour la survie (favorise la création d'espace)
+EMPTY_WEIGHT = 5000.0
+# Termes de ligne : pénalité de non-monotonie (en valeur de tuiles) et paires fusionnables.
+# À 0 par défaut : le score est alors exactement celui du snake + cases vides.
+MONOTONICITY_WEIGHT = 0.0
+MERGE_WEIGHT = 0.0
+
+_SHIFTS = np.arange(4, dtype=np.int64) * 4
+
+
+def _line_exponents() -> np.ndarray:
+    """(65536, 4) : exposant de chaque case pour toutes les lignes possibles."""
+    lines = np.arange(65536, dtype=np.int64)
+    return (lines[:, None] >> _SHIFTS) & 0xF
+
+
+def _build_position_tables(exp_weights, empty_weight) -> List[np.ndarray]:
+    exps = _line_exponents()
+    values = np.where(exps > 0, np.exp2(exps), 0.0)
+    tables = []
+    for r in range(4):
+        weights = np.asarray(exp_weights[r], dtype=np.float64)
+        score = (values * weights).sum(axis=1) + (exps == 0).sum(axis=1) * empty_weight
+        tables.append(score)
+    return tables
+
+
+def _build_line_table(monotonicity_weight, merge_weight) -> np.ndarray:
+    exps = _line_exponents()
+    values = np.where(exps > 0, np.exp2(exps), 0.0)
+
+    diffs = values[:, 1:] - values[:, :-1]
+    increasing = np.clip(diffs, 0, None).sum(axis=1)
+    decreasing = np.clip(-diffs, 0, None).sum(axis=1)
+    non_monotonic = np.minimum(increasing, decreasing)
+
+    merges = ((exps[:, 1:] == exps[:, :-1]) & (exps[:, 1:] > 0)).sum(axis=1)
+
+    return merge_weight * merges - monotonicity_weight * non_monotonic
+
+
+def set_weights(snake_base=None, empty_weight=None, monotonicity_weight=None, merge_weight=None) -> None:
+    """(Re)construit les tables du module avec de nouveaux poids (None = poids actuel)."""
+    global SNAKE_BASE, EXP_WEIGHTS, EMPTY_WEIGHT, MONOTONICITY_WEIGHT, MERGE_WEIGHT
+    global ROW_TABLES, COLUMN_TABLE, _ROW_LISTS, _COLUMN_LIST, _HAS_LINE_TERMS
+
+    if snake_base is not None:
+        SNAKE_BASE = snake_base
+        EXP_WEIGHTS = [[SNAKE_BASE**val for val in row] for row in SNAKE_WEIGHTS]
+    if empty_weight is not None:
+        EMPTY_WEIGHT = empty_weight
+    if monotonicity_weight is not None:
+        MONOTONICITY_WEIGHT = monotonicity_weight
+    if merge_weight is not None:
+        MERGE_WEIGHT = merge_weight
+
+    line_table = _build_line_table(MONOTONICITY_WEIGHT, MERGE_WEIGHT)
+    ROW_TABLES = [table + line_table for table in _build_position_tables(EXP_WEIGHTS, EMPTY_WEIGHT)]
+    COLUMN_TABLE = line_table
+    # Listes Python : l'indexation scalaire y est bien plus rapide que sur un ndarray
+    _ROW_LISTS = [table.tolist() for table in ROW_TABLES]
+    _COLUMN_LIST = COLUMN_TABLE.tolist()
+    _HAS_LINE_TERMS = bool(MONOTONICITY_WEIGHT or MERGE_WEIGHT)
+
+
+def get_weights() -> Dict[str, float]:
+    return {
+        "snake_base": SNAKE_BASE,
+        "empty_weight": EMPTY_WEIGHT,
+        "monotonicity_weight": MONOTONICITY_WEIGHT,
+        "merge_weight": MERGE_WEIGHT,
+    }
+
+
+def load_weights(path=WEIGHTS_FILE) -> bool:
+    """Applique les poids d'un fichier JSON (sortie de `hypnos 2048 tune`). False si absent."""
+    if not path.exists():
+        return False
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    set_weights(**{name: data[name] for name in get_weights() if name in data})
+    return True
+
+
+def save_weights(path=WEIGHTS_FILE, **extra) -> None:
+    """Écrit les poids courants (plus des métadonnées `extra`, ex: fitness)."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({**get_weights(), **extra}, f, indent=4)
+
+
+if not load_weights():
+    set_weights()
+
+
+def evaluate_board(board: int) -> float:
+    """Score statique d'un bitboard : snake + cases vides (+ monotonie / fusions)."""
+    h0, h1, h2, h3 = _ROW_LISTS
+    score = (h0[board & ROW_MASK] + h1[(board >> 16) & ROW_MASK]
+             + h2[(board >> 32) & ROW_MASK] + h3[board >> 48])
+    if not _HAS_LINE_TERMS:
+        return score
+
+    col = _COLUMN_LIST
+    t = transpose(board)
+    return (score + col[t & ROW_MASK] + col[(t >> 16) & ROW_MASK]
+            + col[(t >> 32) & ROW_MASK] + col[t >> 48])
+
+
+_U = np.uint64
+_MASK16 = _U(ROW_MASK)
+_S12, _S16, _S24, _S32, _S48 = _U(12), _U(16), _U(24), _U(32), _U(48)
+
+
+def transpose_packed(boards: np.ndarray) -> np.ndarray:
+    """Même permutation de bits que bitboard.transpose, sur un tableau uint64."""
+    a = ((boards & _U(0xF0F00F0FF0F00F0F))
+         | ((boards & _U(0x0000F0F00000F0F0)) << _S12)
+         | ((boards & _U(0x0F0F00000F0F0000)) >> _S12))
+    return ((a & _U(0xFF00FF0000FF00FF))
+            | ((a & _U(0x00FF00FF00000000)) >> _S24)
+            | ((a & _U(0x00000000FF00FF00)) << _S24))
+
+
+def pack_boards(tiles: np.ndarray) -> np.ndarray:
+    """(N, 4, 4) valeurs de tuiles (0, 2, 4, ...) -> (N,) bitboards uint64."""
+    tiles = np.asarray(tiles)
+    exps = np.zeros(tiles.shape, dtype=np.uint64)
+    nonzero = tiles > 0
+    exps[nonzero] = np.minimum(np.log2(tiles[nonzero]).round(), 15).astype(np.uint64)
+    shifts = (np.arange(16, dtype=np.uint64) * np.uint64(4)).reshape(4, 4)
+    return np.bitwise_or.reduce(exps << shifts, axis=(1, 2))
+
+
+def evaluate_boards(boards) -> np.ndarray:
+    """
+    Score d'un lot de feuilles en un seul appel.
+    `boards` : (N,) bitboards (uint64 ou liste d'int) ou (N, 4, 4) valeurs de tuiles.
+    """
+    boards = np.asarray(boards)
+    if boards.ndim == 3:
+        boards = pack_boards(boards)
+    boards = boards.astype(np.uint64, copy=False)
+
+    h0, h1, h2, h3 = ROW_TABLES
+    score = (h0[boards & _MASK16] + h1[(boards >> _S16) & _MASK16]
+             + h2[(boards >> _S32) & _MASK16] + h3[boards >> _S48])
+    if not _HAS_LINE_TERMS:
+        return score
+
+    col = COLUMN_TABLE
+    t = transpose_packed(boards)
+    return (score + col[t & _MASK16] + col[(t >> _S16) & _MASK16]
+            + col[(t >> _S32) & _MASK16] + col[t >> _S48])
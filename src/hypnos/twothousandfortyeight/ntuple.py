@@ -0,0 +1,247 @@
+"""
+N-tuple network evaluator for 2048.
+
+The value of a board is the sum, over a few 4-cell tuples and the 8 symmetries
+of the board, of one weight looked up by the exponents under the tuple (a flat
+16**4 array per tuple). The weights are learned by TD(0) self-play on the
+offline simulator (afterstate values, Szubert & Jaskowski) and stored as one
+compact float32 .npy file, memory-mapped at load time.
+
+For play, the 8 x T tuple images are grouped by the board cells they cover
+(4 rows, 4 columns and 9 2x2 squares for the default tuples) and each group is
+precomputed, like the heuristic line tables, as one table over the 16**4
+contents of its cells. `evaluate_board` scores one bitboard with a few shifts
+and table lookups, `evaluate_boards` scores a batch of leaves with the same
+tables through NumPy fancy indexing; both return bit-identical floats.
+`evaluate_board` also memoizes its values, since expectimax reaches the same
+leaf through many paths. Tables and memo are reset by `update`, training
+reads the raw weights (`values`).
+"""
+
+import time
+from array import array
+from importlib import resources
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from hypnos.twothousandfortyeight.bitboard import MOVES, move_score, transpose
+from hypnos.twothousandfortyeight.heuristic import transpose_packed
+from hypnos.twothousandfortyeight.simulator import Game2048
+
+DATA_PATH = resources.files("hypnos.twothousandfortyeight.data")
+NTUPLE_FILE = DATA_PATH / "ntuple.npy"
+
+# Cases indexées 4 * ligne + colonne. Avec les 8 symétries, ces 5 tuples couvrent
+# toutes les lignes, colonnes et carrés 2x2 du plateau.
+TUPLES: Tuple[Tuple[int, ...], ...] = (
+    (0, 1, 2, 3),
+    (4, 5, 6, 7),
+    (0, 1, 4, 5),
+    (1, 2, 5, 6),
+    (5, 6, 9, 10),
+)
+
+# Pas TD global, réparti sur les 8 x T poids actifs d'un board
+LEARNING_RATE = 0.1
+# Valeurs mémorisées par evaluate_board : une feuille revient souvent d'un chemin à l'autre
+VALUE_CACHE_SIZE = 1 << 18
+
+_U = np.uint64
+_CELL_SHIFTS = np.arange(16, dtype=np.uint64) * _U(4)
+
+
+def _flip_rows(boards: np.ndarray) -> np.ndarray:
+    """Miroir gauche-droite (inverse les nibbles de chaque ligne)."""
+    return (((boards & _U(0x000F000F000F000F)) << _U(12))
+            | ((boards & _U(0x00F000F000F000F0)) << _U(4))
+            | ((boards & _U(0x0F000F000F000F00)) >> _U(4))
+            | ((boards & _U(0xF000F000F000F000)) >> _U(12)))
+
+
+def _flip_cols(boards: np.ndarray) -> np.ndarray:
+    """Miroir haut-bas (inverse l'ordre des lignes)."""
+    return (((boards & _U(0xFFFF)) << _U(48))
+            | ((boards & _U(0xFFFF0000)) << _U(16))
+            | ((boards >> _U(16)) & _U(0xFFFF0000))
+            | (boards >> _U(48)))
+
+
+def symmetries(boards: np.ndarray) -> np.ndarray:
+    """(N,) bitboards -> (8, N) : les 8 symétries du carré."""
+    t = transpose_packed(boards)
+    base = np.stack([boards, _flip_cols(boards), t, _flip_cols(t)])
+    return np.concatenate([base, _flip_rows(base)])
+
+
+def _symmetry_cells() -> np.ndarray:
+    """(8, 16) : case du plateau d'origine sous chaque case de chaque symétrie."""
+    marker = np.array([sum(p << (4 * p) for p in range(16))], dtype=np.uint64)
+    return ((symmetries(marker)[:, 0, None] >> _CELL_SHIFTS) & _U(0xF)).astype(np.int64)
+
+
+def _segments(positions: Sequence[int]) -> Tuple[Tuple[int, int], ...]:
+    """(décalage, masque) de chaque suite de cases contiguës : la clé est leur OU."""
+    segments = []
+    for j, p in enumerate(positions):
+        if j and p == positions[j - 1] + 1:
+            shift, mask = segments[-1]
+            segments[-1] = (shift, mask | (0xF << (4 * j)))
+        else:
+            segments.append((4 * (p - j), 0xF << (4 * j)))
+    return tuple(segments)
+
+
+class NTupleNetwork:
+    def __init__(self, weights: Optional[np.ndarray] = None, tuples: Sequence[Sequence[int]] = TUPLES):
+        self.tuples = np.asarray(tuples, dtype=np.int64)
+        size = 16 ** self.tuples.shape[1]
+        if weights is None:
+            weights = np.zeros((len(self.tuples), size), dtype=np.float32)
+        if weights.shape != (len(self.tuples), size):
+            raise ValueError(f"Weights of shape {weights.shape} do not match {len(self.tuples)} tuples of size {size}")
+        self.weights = weights
+        self._place = 16 ** np.arange(self.tuples.shape[1], dtype=np.int64)
+        self._rows = np.arange(len(self.tuples))
+        self._lookups = None
+        self._tables = None
+        self._cache = {}
+
+    @classmethod
+    def load(cls, path=NTUPLE_FILE, writable: bool = False) -> "NTupleNetwork":
+        """Charge un réseau. Mappé en mémoire (lecture seule) sauf pour l'entraîner."""
+        weights = np.load(path) if writable else np.load(path, mmap_mode="r")
+        return cls(weights)
+
+    def save(self, path=NTUPLE_FILE) -> None:
+        np.save(path, np.asarray(self.weights, dtype=np.float32))
+
+    def indices(self, boards) -> np.ndarray:
+        """(N,) bitboards -> (8, N, T) index de chaque tuple dans sa table."""
+        boards = np.asarray(boards, dtype=np.uint64)
+        cells = (symmetries(boards)[..., None] >> _CELL_SHIFTS) & _U(0xF)  # (8, N, 16)
+        return cells.astype(np.int64)[..., self.tuples] @ self._place
+
+    def values(self, boards) -> np.ndarray:
+        """Valeurs lues directement dans les poids (entraînement : pas de tables à reconstruire)."""
+        return self.weights[self._rows, self.indices(boards)].sum(axis=(0, 2), dtype=np.float64)
+
+    def _build_tables(self) -> None:
+        """
+        Regroupe les 8 x T images des tuples par cases couvertes et précalcule, pour chaque
+        groupe, la somme de ses poids sur tous les contenus possibles de ces cases.
+        """
+        cells = _symmetry_cells()[:, self.tuples]  # (8, T, n) case d'origine de chaque case du tuple
+        groups = {}
+        for s in range(len(cells)):
+            for t, tuple_cells in enumerate(cells[s].tolist()):
+                groups.setdefault(frozenset(tuple_cells), []).append((t, tuple_cells))
+
+        keys = np.arange(16 ** self.tuples.shape[1], dtype=np.int64)
+        lookups, tables = [], []
+        for members in groups.values():
+            # Clé lue sur le plateau ou sa transposée, selon celle où les cases sont le plus contiguës
+            sources = [sorted(members[0][1]), sorted(4 * (p % 4) + p // 4 for p in members[0][1])]
+            source = min((0, 1), key=lambda i: len(_segments(sources[i])))
+            rank = {p: j for j, p in enumerate(sources[source])}
+            table = np.zeros(len(keys))
+            for t, tuple_cells in members:
+                positions = [p if source == 0 else 4 * (p % 4) + p // 4 for p in tuple_cells]
+                index = sum(((keys >> (4 * rank[p])) & 0xF) << (4 * k) for k, p in enumerate(positions))
+                table += self.weights[t][index]
+            segments = _segments(sources[source])
+            # array('d') : indexation scalaire aussi rapide qu'une liste, sans un objet float par case
+            lookups.append((array("d", table.tolist()), source, segments))
+            tables.append((table, source, tuple((_U(shift), _U(mask)) for shift, mask in segments)))
+        self._lookups, self._tables = lookups, tables
+
+    def evaluate_boards(self, boards) -> np.ndarray:
+        boards = np.asarray(boards, dtype=np.uint64)
+        if self._tables is None:
+            self._build_tables()
+        sources = (boards, transpose_packed(boards))
+        score = np.zeros(len(boards))
+        for table, source, segments in self._tables:
+            b = sources[source]
+            key = np.zeros(len(boards), dtype=np.uint64)
+            for shift, mask in segments:
+                key |= (b >> shift) & mask
+            score += table[key]
+        return score
+
+    def evaluate_board(self, board: int) -> float:
+        score = self._cache.get(board)
+        if score is not None:
+            return score
+        if self._lookups is None:
+            self._build_tables()
+        sources = (board, transpose(board))
+        score = 0.0
+        for table, source, segments in self._lookups:
+            b = sources[source]
+            key = 0
+            for shift, mask in segments:
+                key |= (b >> shift) & mask
+            score += table[key]
+        if len(self._cache) >= VALUE_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[board] = score
+        return score
+
+    def update(self, board: int, delta: float) -> None:
+        """TD : ajoute `delta` (déjà multiplié par le pas) aux poids actifs du board."""
+        idx = self.indices([board])[:, 0, :]  # (8, T)
+        # add.at : une même case de table peut être touchée par plusieurs symétries
+        np.add.at(self.weights, (np.broadcast_to(self._rows, idx.shape), idx), np.float32(delta))
+        self._lookups = self._tables = None
+        self._cache.clear()
+
+
+def _best_afterstate(net: NTupleNetwork, board: int):
+    """(direction, afterstate, récompense) maximisant récompense + V(afterstate)."""
+    options = [(d, func(board)) for d, func in MOVES.items()]
+    options = [(d, after) for d, after in options if after != board]
+    if not options:
+        return None
+    rewards = [move_score(board, d) for d, _ in options]
+    values = net.values([after for _, after in options])
+    best = int(np.argmax(np.asarray(rewards) + values))
+    return options[best][0], options[best][1], rewards[best]
+
+
+def train(games: int = 1000, seed: int = 0, path=NTUPLE_FILE, learning_rate: float = LEARNING_RATE,
+          report_every: int = 100) -> NTupleNetwork:
+    """TD(0) sur les afterstates, parties auto-jouées sur le simulateur. Reprend `path` s'il existe."""
+    net = NTupleNetwork.load(path, writable=True) if path.exists() else NTupleNetwork()
+    step = learning_rate / (8 * len(net.tuples))
+    scores = []
+    started = time.time()
+
+    for i in range(games):
+        game = Game2048(seed + i)
+        choice = _best_afterstate(net, game.board)
+        while choice is not None:
+            direction, after, _ = choice
+            game.move(direction)
+            choice = _best_afterstate(net, game.board)
+            if choice is None:
+                target = 0.0
+            else:
+                _, next_after, next_reward = choice
+                target = next_reward + float(net.values([next_after])[0])
+            net.update(after, step * (target - float(net.values([after])[0])))
+        scores.append(game.score)
+
+        if (i + 1) % report_every == 0 or i + 1 == games:
+            recent = scores[-report_every:]
+            print(f"Game {i + 1}/{games}: mean score {np.mean(recent):.0f}, "
+                  f"max {max(recent)} ({time.time() - started:.0f}s)")
+            net.save(path)
+
+    return net
+
+
+def main(games: int = 1000, seed: int = 0) -> None:
+    print(f"TD(0) training of the n-tuple network on {games} self-play games (seed={seed})...")
+    train(games, seed)
+    print(f"Saved to {NTUPLE_FILE}")
@@ -0,0 +1,118 @@
+"""
+Parallel root search for the 2048 solver.
+
+The root moves (or root move x first chance node children) are evaluated on a
+persistent pool of worker processes. Workers are started once and kept warm:
+the bitboard and heuristic tables are built a single time per worker, and each
+worker keeps its own transposition table from one turn to the next.
+
+Node values are a pure function of their cache key (see solve.expectimax) and
+chance nodes are recombined with solve.chance_value, so the scores are
+bit-for-bit identical to the serial search.
+"""
+
+import os
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from typing import List, Optional
+
+from hypnos.twothousandfortyeight import solve
+from hypnos.twothousandfortyeight.bitboard import empty_cells
+
+SPLIT_MODES = ("root", "chance")
+# Intervalle (s) auquel l'attente des workers teste la condition d'abandon (solve.abort_scope)
+ABORT_POLL = 0.002
+
+
+def _warmup(_: int) -> int:
+    # Force la création du processus (et l'import des tables) avant le premier coup
+    return os.getpid()
+
+
+def _search_root(outcome: int, depth: int, max_cost: int, deadline: Optional[float]) -> float:
+    with solve.deadline_scope(deadline):
+        return solve.expectimax(outcome, depth, False, solve.TRANSPOSITION_TABLE, max_cost=max_cost)
+
+
+def _search_spawn(outcome: int, shift: int, depth: int, max_cost: int, costs,
+                  deadline: Optional[float]) -> tuple:
+    with solve.deadline_scope(deadline):
+        return solve.spawn_scores(outcome, shift, depth, solve.TRANSPOSITION_TABLE, 0, 0, max_cost, costs)
+
+
+class ParallelSearcher:
+    """
+    Pool de processus persistant pour get_best_move(..., searcher=...).
+
+    - split="root"   : une tâche par coup légal (au plus 4).
+    - split="chance" : une tâche par (coup légal, case vide), soit jusqu'à ~60 tâches,
+                       de quoi occuper 16 coeurs.
+    """
+
+    def __init__(self, workers: Optional[int] = None, split: str = "chance", evaluator: str = "heuristic"):
+        if split not in SPLIT_MODES:
+            raise ValueError(f"Unknown split mode: {split} (expected one of {SPLIT_MODES})")
+        self.workers = workers or os.cpu_count() or 1
+        self.split = split
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=solve.set_evaluator,
+                                        initargs=(evaluator,))
+        list(self.pool.map(_warmup, range(self.workers)))
+
+    def score_moves(self, outcomes: List[int], depth: int, max_cost: int,
+                    deadline: Optional[float] = None) -> List[float]:
+        """
+        Scores des boards obtenus après chaque coup racine (noeuds de hasard à `depth`).
+        Lève solve.SearchTimeout si `deadline` (time.time()) est dépassée dans un worker,
+        solve.SearchAborted si la condition de solve.abort_scope devient vraie pendant l'attente.
+        """
+        if self.split == "root":
+            futures = [self.pool.submit(_search_root, outcome, depth, max_cost, deadline)
+                       for outcome in outcomes]
+            return self._collect(futures, lambda results: results)
+
+        jobs = []
+        for outcome in outcomes:
+            cells = empty_cells(outcome)
+            if not cells:
+                jobs.append(solve.evaluate_board(outcome))
+                continue
+            costs = solve.SPAWN_COSTS[len(cells)]
+            jobs.append([self.pool.submit(_search_spawn, outcome, shift, depth, max_cost, costs, deadline)
+                         for shift in cells])
+
+        futures = [f for job in jobs if isinstance(job, list) for f in job]
+
+        def combine(results):
+            it = iter(results)
+            return [
+                job if not isinstance(job, list) else solve.chance_value([next(it) for _ in job])
+                for job in jobs
+            ]
+
+        return self._collect(futures, combine)
+
+    @staticmethod
+    def _collect(futures, combine):
+        try:
+            waiting = set(futures)
+            while waiting:
+                if solve.search_aborted():
+                    raise solve.SearchAborted()
+                done, waiting = wait(waiting, timeout=ABORT_POLL, return_when=FIRST_EXCEPTION)
+                if any(f.exception() is not None for f in done):
+                    break
+            return combine([f.result() for f in futures])
+        except solve.SearchTimeout:
+            # Les tâches pas encore démarrées sont annulées, les autres s'arrêtent
+            # d'elles-mêmes sur la même échéance (sans échéance, elles vont à leur terme)
+            for f in futures:
+                f.cancel()
+            raise
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "ParallelSearcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,70 @@
+"""
+Offline 2048 game, same rules as the API: after every move that changes the
+board, a tile appears on a uniformly random empty cell (2 with 90%, 4 with 10%).
+The game starts with two tiles and is over when no move changes the board.
+
+Everything is driven by a seeded random.Random, so a seed replays the exact
+same spawn sequence for the same moves.
+"""
+
+import random
+from typing import List, Optional
+
+from hypnos.twothousandfortyeight.bitboard import (
+    MOVES, empty_cells, from_bitboard, max_exponent, move_score
+)
+
+
+class Game2048:
+    def __init__(self, seed: Optional[int] = None, board: int = 0, score: int = 0):
+        self.rng = random.Random(seed)
+        self.board = board
+        self.score = score
+        self.moves = 0
+        if not board:
+            self.spawn()
+            self.spawn()
+
+    def spawn(self) -> bool:
+        cells = empty_cells(self.board)
+        if not cells:
+            return False
+        shift = self.rng.choice(cells)
+        exp = 1 if self.rng.random() < 0.9 else 2
+        self.board |= exp << shift
+        return True
+
+    def legal_moves(self) -> List[str]:
+        return [direction for direction, func in MOVES.items() if func(self.board) != self.board]
+
+    def move(self, direction: str) -> bool:
+        """Joue `direction`. Retourne False (sans rien changer) si le coup est illégal."""
+        new_board = MOVES[direction](self.board)
+        if new_board == self.board:
+            return False
+        self.score += move_score(self.board, direction)
+        self.board = new_board
+        self.moves += 1
+        self.spawn()
+        return True
+
+    def is_over(self) -> bool:
+        return not self.legal_moves()
+
+    def max_tile(self) -> int:
+        exp = max_exponent(self.board)
+        return 1 << exp if exp else 0
+
+    def grid(self) -> List[List[int]]:
+        """Board au format API (liste de listes de valeurs)."""
+        return from_bitboard(self.board)
+
+    def state(self) -> dict:
+        """Même forme que la réponse de l'API /move."""
+        over = self.is_over()
+        return {
+            "board": self.grid(),
+            "score": self.score,
+            "game_over": over,
+            "won": self.max_tile() >= 2048,
+        }
@@ -1,144 +1,204 @@
 import os
+import math
 import time
 import requests
-import random
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-AUTH_TOKEN = os.getenv("AUTH_TOKEN")
-CSRF_TOKEN = os.getenv("CSRF_TOKEN")
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import numpy as np
+from hypnos.lib.session import get_cookies, get_session
+from hypnos.twothousandfortyeight.bitboard import (
+    MOVES, count_empty, empty_cells, to_bitboard
+)
+from hypnos.twothousandfortyeight import heuristic
+from hypnos.twothousandfortyeight.heuristic import evaluate_board, evaluate_boards
+from hypnos.twothousandfortyeight.transposition import MAX_COST, TranspositionTable
+
+COOKIES = get_cookies()
+AUTH_TOKEN = COOKIES['auth_token']
+CSRF_TOKEN = COOKIES['csrf_token']
 
 BASE_URL = "https://play.hypnos2026.fr/api/arg/2048"
-HEADERS = {
-    'accept': '*/*',
-    'accept-language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7',
-    'content-type': 'application/json',
-    'origin': 'https://play.hypnos2026.fr',
-    'referer': 'https://play.hypnos2026.fr/game/2048/',
-    'priority': 'u=1, i',
-    'sec-ch-ua': '"Google Chrome";v="143", "Chromium";v="143", "Not A(Brand";v="24"',
-    'sec-ch-ua-mobile': '?0',
-    'sec-ch-ua-platform': '"Windows"',
-    'sec-fetch-dest': 'empty',
-    'sec-fetch-mode': 'cors',
-    'sec-fetch-site': 'same-origin',
-    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36',
-    'x-csrf-token': CSRF_TOKEN
-}
-
-COOKIES = {
-    'auth_token': AUTH_TOKEN,
-    'csrf_token': CSRF_TOKEN
-}
-
-# --- 2048 Game Logic for Simulation ---
-
-def transpose(board):
-    return [list(row) for row in zip(*board)]
-
-def invert(board):
-    return [row[::-1] for row in board]
-
-def merge_row(row):
-    new_row = [i for i in row if i != 0]
-    for i in range(len(new_row) - 1):
-        if new_row[i] == new_row[i+1]:
-            new_row[i] *= 2
-            new_row[i+1] = 0
-    new_row = [i for i in new_row if i != 0]
-    new_row = new_row + [0] * (4 - len(new_row))
-    return new_row
-
-def move_left(board):
-    new_board = []
-    for row in board:
-        new_board.append(merge_row(row))
-    return new_board
-
-def move_right(board):
-    inverted = invert(board)
-    moved = move_left(inverted)
-    return invert(moved)
-
-def move_up(board):
-    transposed = transpose(board)
-    moved = move_left(transposed)
-    return transpose(moved)
-
-def move_down(board):
-    transposed = transpose(board)
-    moved = move_right(transposed)
-    return transpose(moved)
-
-MOVES = {
-    'up': move_up,
-    'down': move_down,
-    'left': move_left,
-    'right': move_right
-}
-
-def get_empty_cells(board):
-    cells = []
-    for r in range(4):
-        for c in range(4):
-            if board[r][c] == 0:
-                cells.append((r, c))
-    return cells
-
-def boards_equal(b1, b2):
-    for r in range(4):
-        for c in range(4):
-            if b1[r][c] != b2[r][c]:
-                return False
-    return True
+
+# Session keep-alive : une connexion TLS réutilisée pour tous les coups (2 avec --speculative,
+# dont le thread HTTP envoie /move pendant la recherche)
+SESSION = get_session('https://play.hypnos2026.fr/game/2048/', COOKIES, retries=2, timeout=5, pool_size=2)
 
 # --- AI Solver (Expectimax) ---
 
-# Snake Pattern: Force les grosses tuiles vers le bas-droite (3,3)
-# Note: Ton 1024 est en bas à gauche actuellement, mais l'IA devrait s'adapter grâce à la profondeur.
-SNAKE_WEIGHTS = [
-    [2,   3,  4,  5],
-    [9,   8,  7,  6],
-    [10, 11, 12, 13],
-    [20, 19, 18, 17]
-]
-EXP_WEIGHTS = [[4**val for val in row] for row in SNAKE_WEIGHTS]
-
-def evaluate_board(board):
-    """Score statique : Poids des tuiles + Bonus cases vides."""
-    score = 0
-    empty_count = 0
-    for r in range(4):
-        for c in range(4):
-            val = board[r][c]
-            if val == 0:
-                empty_count += 1
-            else:
-                score += val * EXP_WEIGHTS[r][c]
-    
-    # Bonus vital pour la survie (augmenté pour favoriser la création d'espace)
-    score += empty_count * 5000 
-    return score
+# Cache partagé entre les 4 coups racine et entre les tours d'une même partie
+TRANSPOSITION_TABLE = TranspositionTable()
+
+# Évaluation des feuilles : heuristique (heuristic.py) ou réseau n-tuple appris (ntuple.py)
+EVALUATORS = ("heuristic", "ntuple")
+EVALUATOR = "heuristic"
+
+def set_evaluator(name="heuristic", path=None):
+    """
+    Remplace evaluate_board / evaluate_boards utilisés par expectimax.
+    `path` : fichier .npy du réseau (défaut : data/ntuple.npy). Vide le cache de transposition,
+    dont les valeurs dépendent de l'évaluateur.
+    """
+    global evaluate_board, evaluate_boards, EVALUATOR, BATCH_MIN_LEAVES
+    if name == "ntuple":
+        from hypnos.twothousandfortyeight.ntuple import NTUPLE_FILE, NTupleNetwork
+        path = path or NTUPLE_FILE
+        try:
+            net = NTupleNetwork.load(path)
+        except FileNotFoundError:
+            raise SystemExit(f"No n-tuple network at {path}: run `hypnos 2048 train` first "
+                             "(or use --evaluator heuristic)") from None
+        evaluate_board, evaluate_boards = net.evaluate_board, net.evaluate_boards
+        BATCH_MIN_LEAVES = NTUPLE_BATCH_MIN_LEAVES
+    elif name == "heuristic":
+        evaluate_board, evaluate_boards = heuristic.evaluate_board, heuristic.evaluate_boards
+        BATCH_MIN_LEAVES = HEURISTIC_BATCH_MIN_LEAVES
+    else:
+        raise ValueError(f"Unknown evaluator: {name} (expected one of {EVALUATORS})")
+    EVALUATOR = name
+    TRANSPOSITION_TABLE.clear()
+
+# Élagage probabiliste des noeuds de hasard :
+# - un sous-arbre dont la probabilité cumulée tombe sous CPROB_THRESHOLD est évalué statiquement
+# - une ligne de recherche ne peut pas faire apparaître plus de MAX_FOURS tuiles "4"
+CPROB_THRESHOLD = 1e-4
+MAX_FOURS = 2
+
+# La probabilité cumulée est suivie en "coût" entier (quarts de bit, -4*log2(p) arrondi
+# au supérieur pour chaque tirage). La valeur d'un noeud ne dépend donc que de
+# (board, depth, tour, coût, nb de 4) : le cache reste exact et la recherche déterministe.
+_COST_SCALE = 4
+
+def _spawn_cost(p):
+    return math.ceil(-_COST_SCALE * math.log2(p))
+
+# SPAWN_COSTS[n] = (coût d'un 2, coût d'un 4) quand n cases sont vides
+SPAWN_COSTS = [(0, 0)] + [(_spawn_cost(0.9 / n), _spawn_cost(0.1 / n)) for n in range(1, 17)]
+
+def max_prob_cost(threshold=None):
+    """Coût maximal autorisé pour un seuil de probabilité donné (défaut : CPROB_THRESHOLD)."""
+    threshold = CPROB_THRESHOLD if threshold is None else threshold
+    if not 0 < threshold <= 1:
+        raise ValueError(f"Probability threshold must be in (0, 1], got {threshold}")
+    cost = int(-_COST_SCALE * math.log2(threshold))
+    # Le coût fait partie de la clé de transposition : au-delà de MAX_COST, deux noeuds partageraient une clé
+    if cost > MAX_COST:
+        raise ValueError(f"Probability threshold {threshold} is too small (cost {cost} > {MAX_COST})")
+    return cost
+
+# Derniers niveaux : les feuilles sont collectées et évaluées en un seul appel NumPy
+# (evaluate_boards) dès qu'elles sont assez nombreuses pour amortir l'appel.
+HEURISTIC_BATCH_MIN_LEAVES = 32
+# Le réseau n-tuple mémorise ses valeurs en scalaire : le lot ne paie qu'au-delà
+NTUPLE_BATCH_MIN_LEAVES = 48
+BATCH_MIN_LEAVES = HEURISTIC_BATCH_MIN_LEAVES
+
+# Approfondissement itératif : budget de temps par coup
+MAX_SEARCH_DEPTH = 12
+DEADLINE_CHECK_INTERVAL = 1024 # On regarde l'horloge tous les ~1024 noeuds
+
+class SearchTimeout(Exception):
+    """Levée dans expectimax quand le budget de temps du coup est épuisé."""
+
+class SearchAborted(SearchTimeout):
+    """Levée quand la condition de abort_scope devient vraie : le résultat ne sert plus."""
+
+# Compteur global de noeuds visités (stats / benchmark), échéance et condition d'abandon
+# de la recherche en cours
+nodes_searched = 0
+_search_deadline = None
+_search_abort = None
+_next_deadline_check = 0
+
+@contextmanager
+def deadline_scope(deadline):
+    """Active une échéance (time.time()) pour les appels à expectimax du bloc."""
+    global _search_deadline
+    previous = _search_deadline
+    _search_deadline = deadline
+    try:
+        yield
+    finally:
+        _search_deadline = previous
 
-def expectimax(board, depth, is_player_turn):
+@contextmanager
+def abort_scope(abort):
+    """
+    Active une condition d'abandon (callable sans argument, ex : Future.done) pour les
+    recherches du bloc. Testée avec l'échéance ; vraie, elle lève SearchAborted, que
+    get_best_move laisse remonter même en approfondissement itératif.
+    """
+    global _search_abort
+    previous = _search_abort
+    _search_abort = abort
+    try:
+        yield
+    finally:
+        _search_abort = previous
+
+def search_aborted():
+    return _search_abort is not None and _search_abort()
+
+def expectimax(board, depth, is_player_turn, table=None, prob_cost=0, fours=0, max_cost=None):
     """
     Récursivité optimisée pour éviter le blocage 'no valid moves'.
+    `board` est un bitboard (voir hypnos.twothousandfortyeight.bitboard).
+    `table` : TranspositionTable optionnelle pour réutiliser les noeuds déjà évalués.
+    `prob_cost` / `fours` : probabilité cumulée (en coût) et nombre de 4 apparus sur la ligne.
+    `max_cost` : seuil d'élagage (voir max_prob_cost), CPROB_THRESHOLD par défaut.
     """
-    # Si profondeur atteinte, on évalue
-    if depth == 0:
+    global nodes_searched, _next_deadline_check
+    nodes_searched += 1
+    # Seuil plutôt que masque : les feuilles évaluées en lot font avancer le compteur par sauts
+    if (_search_deadline is not None or _search_abort is not None) and nodes_searched >= _next_deadline_check:
+        _next_deadline_check = nodes_searched + DEADLINE_CHECK_INTERVAL
+        # Aucune valeur partielle n'est mise en cache : la table reste exacte
+        if _search_abort is not None and _search_abort():
+            raise SearchAborted()
+        if _search_deadline is not None and time.time() > _search_deadline:
+            raise SearchTimeout()
+
+    if max_cost is None:
+        max_cost = max_prob_cost()
+
+    # Si profondeur atteinte ou ligne trop improbable, on évalue
+    if depth == 0 or prob_cost > max_cost:
         return evaluate_board(board)
 
+    key = None
+    if table is not None and depth >= table.min_depth:
+        key = table.make_key(board, depth, is_player_turn, prob_cost, fours, max_cost)
+        cached = table.get(key)
+        if cached is not None:
+            return cached
+
+    value = _expectimax_node(board, depth, is_player_turn, table, prob_cost, fours, max_cost)
+    if key is not None:
+        table.put(key, value)
+    return value
+
+def _leaf_values(boards):
+    """Scores des feuilles (profondeur 0), en lot si elles sont nombreuses."""
+    global nodes_searched
+    nodes_searched += len(boards)
+    if len(boards) >= BATCH_MIN_LEAVES:
+        return evaluate_boards(np.array(boards, dtype=np.uint64)).tolist()
+    return [evaluate_board(b) for b in boards]
+
+def _expectimax_node(board, depth, is_player_turn, table, prob_cost, fours, max_cost):
+    if depth == 1:
+        return _last_ply_value(board, is_player_turn)
+    if depth == 2 and not is_player_turn:
+        return _last_two_plies_value(board, prob_cost, fours, max_cost)
+
     if is_player_turn:
         best_score = -float('inf')
         moved = False
         
-        for direction, func in MOVES.items():
+        for func in MOVES.values():
             new_board = func(board)
-            if not boards_equal(new_board, board):
+            if new_board != board:
                 moved = True
-                score = expectimax(new_board, depth - 1, is_player_turn=False)
+                score = expectimax(new_board, depth - 1, False, table, prob_cost, fours, max_cost)
                 if score > best_score:
                     best_score = score
         
@@ -151,87 +211,237 @@ def expectimax(board, depth, is_player_turn):
 
     else:
         # Tour du hasard (apparition d'un 2 ou 4)
-        empty_cells = get_empty_cells(board)
+        cells = empty_cells(board)
         
         # Si plus de place, c'est Game Over dans la simulation -> on retourne le score
-        if not empty_cells:
+        if not cells:
             return evaluate_board(board)
 
-        # Optimisation : Echantillonnage si trop de cases vides
-        if len(empty_cells) > 5 and depth >= 3:
-            empty_cells = random.sample(empty_cells, 5)
+        costs = SPAWN_COSTS[len(cells)]
+        return chance_value([
+            spawn_scores(board, shift, depth, table, prob_cost, fours, max_cost, costs)
+            for shift in cells
+        ])
 
-        avg_score = 0
-        total_weight = 0
-        
-        for r, c in empty_cells:
-            # Simulation 2 (90% proba)
-            # Copie manuelle rapide
-            b2 = [row[:] for row in board]
-            b2[r][c] = 2
-            score2 = expectimax(b2, depth - 1, is_player_turn=True)
-            avg_score += 0.9 * score2
-            
-            # Simulation 4 (10% proba)
-            b4 = [row[:] for row in board]
-            b4[r][c] = 4
-            score4 = expectimax(b4, depth - 1, is_player_turn=True)
-            avg_score += 0.1 * score4
-            
-            total_weight += 1
-            
-        return avg_score / total_weight
-
-def get_best_move(board):
-    """Détermine le meilleur mouvement avec fallback de sécurité."""
-    empty_len = len(get_empty_cells(board))
+def _last_ply_value(board, is_player_turn):
+    """Même valeur que la récursion générique à depth == 1, feuilles évaluées en lot."""
+    if is_player_turn:
+        children = [b for b in (func(board) for func in MOVES.values()) if b != board]
+        if not children:
+            return evaluate_board(board)
+        return max(_leaf_values(children))
+
+    cells = empty_cells(board)
+    if not cells:
+        return evaluate_board(board)
+    # À depth 1, le 4 est évalué statiquement qu'il soit plafonné ou non
+    leaves = []
+    for shift in cells:
+        leaves.append(board | (1 << shift))
+        leaves.append(board | (2 << shift))
+    values = _leaf_values(leaves)
+    return chance_value(zip(values[0::2], values[1::2]))
+
+def _last_two_plies_value(board, prob_cost, fours, max_cost):
+    """
+    Noeud de hasard à depth 2 : toutes les feuilles des coups joueurs qui suivent
+    chaque apparition (jusqu'à ~120 boards) partent dans un seul lot.
+    Même valeur que spawn_scores -> expectimax(depth 1) -> _last_ply_value.
+    """
+    global nodes_searched
+    cells = empty_cells(board)
+    if not cells:
+        return evaluate_board(board)
+
+    cost2, cost4 = SPAWN_COSTS[len(cells)]
+    leaves = []
+    slots = [] # par apparition : tranche de `leaves` dont on prend le max
+    for shift in cells:
+        for child, expand in ((board | (1 << shift), prob_cost + cost2 <= max_cost),
+                              (board | (2 << shift), fours < MAX_FOURS and prob_cost + cost4 <= max_cost)):
+            start = len(leaves)
+            if expand:
+                leaves.extend(b for b in (func(child) for func in MOVES.values()) if b != child)
+            if len(leaves) == start:
+                # Élagué, plafonné ou sans coup possible : évaluation statique de l'apparition
+                leaves.append(child)
+            slots.append((start, len(leaves)))
+    nodes_searched += len(slots)
+
+    values = _leaf_values(leaves)
+    spawn_values = [max(values[start:end]) for start, end in slots]
+    return chance_value(zip(spawn_values[0::2], spawn_values[1::2]))
+
+def spawn_scores(board, shift, depth, table, prob_cost, fours, max_cost, costs):
+    """Scores (apparition d'un 2, apparition d'un 4) dans la case `shift` d'un noeud de hasard."""
+    cost2, cost4 = costs
+    # Simulation 2 (90% proba) : exposant 1 dans la case vide
+    score2 = expectimax(board | (1 << shift), depth - 1, True, table,
+                        prob_cost + cost2, fours, max_cost)
     
-    # Ajustement dynamique de la profondeur vs vitesse
-    if empty_len >= 8:
-        search_depth = 2
-    elif empty_len >= 4:
-        search_depth = 3
+    # Simulation 4 (10% proba) : exposant 2, plafonné à MAX_FOURS par ligne
+    b4 = board | (2 << shift)
+    if fours < MAX_FOURS:
+        score4 = expectimax(b4, depth - 1, True, table, prob_cost + cost4, fours + 1, max_cost)
     else:
-        search_depth = 4 # Mode survie (ton cas actuel)
+        score4 = evaluate_board(b4)
+    return score2, score4
 
+def chance_value(spawns):
+    """
+    Moyenne d'un noeud de hasard à partir des (score2, score4) de chaque case vide.
+    L'ordre des additions est fixe : la recherche parallèle retombe sur les mêmes flottants.
+    """
+    avg_score = 0
+    count = 0
+    for score2, score4 in spawns:
+        avg_score += 0.9 * score2
+        avg_score += 0.1 * score4
+        count += 1
+    return avg_score / count
+
+def _score_moves(legal_moves, depth, table, max_cost, searcher, deadline):
+    outcomes = [outcome for _, outcome in legal_moves]
+    if searcher is not None:
+        return searcher.score_moves(outcomes, depth, max_cost, deadline)
+    with deadline_scope(deadline):
+        return [expectimax(outcome, depth, False, table, max_cost=max_cost) for outcome in outcomes]
+
+def _score_moves_until(legal_moves, depth, table, max_cost, searcher, deadline):
+    """
+    Scores des coups dans l'ordre de `legal_moves` jusqu'à l'échéance : la liste renvoyée
+    s'arrête au premier coup non terminé. Le pool parallèle cherche tous les coups à la fois,
+    son itération est complète ou vide.
+    """
+    if searcher is not None:
+        try:
+            return _score_moves(legal_moves, depth, table, max_cost, searcher, deadline)
+        except SearchAborted:
+            raise
+        except SearchTimeout:
+            return []
+    scores = []
+    with deadline_scope(deadline):
+        for _, outcome in legal_moves:
+            try:
+                scores.append(expectimax(outcome, depth, False, table, max_cost=max_cost))
+            except SearchAborted:
+                raise
+            except SearchTimeout:
+                break
+    return scores
+
+def _pick_best(legal_moves, scores):
     best_score = -float('inf')
-    best_move = None
-    
-    legal_moves = []
-    for direction, func in MOVES.items():
-        outcome = func(board)
-        if not boards_equal(outcome, board):
-            legal_moves.append((direction, outcome))
-    
-    if not legal_moves:
-        return None
-
     # CORRECTIF SÉCURITÉ :
     # On initialise best_move avec le premier coup légal valide.
     # Ainsi, si tous les scores renvoyés sont pourris (ex: -inf),
     # l'IA jouera quand même quelque chose au lieu de planter.
     best_move = legal_moves[0][0]
-    
-    for direction, outcome in legal_moves:
-        score = expectimax(outcome, search_depth, is_player_turn=False)
-        
+    for (direction, outcome), score in zip(legal_moves, scores):
         # Debug optionnel pour voir ce que l'IA pense
         # print(f"Dir: {direction}, Score: {score}")
         
         if score > best_score:
             best_score = score
             best_move = direction
-            
     return best_move
 
+def get_best_move(board, table=TRANSPOSITION_TABLE, prob_threshold=None, searcher=None, time_budget=None):
+    """
+    Détermine le meilleur mouvement avec fallback de sécurité.
+    `board` peut être la grille de l'API (liste de listes) ou un bitboard.
+    `table` est partagée par tous les coups racine (None pour désactiver le cache).
+    `prob_threshold` remplace CPROB_THRESHOLD pour cette recherche.
+    `searcher` : ParallelSearcher optionnel (hypnos.twothousandfortyeight.parallel)
+    pour évaluer les coups racine sur un pool de processus. Résultat identique au mode série.
+    `time_budget` (secondes) : approfondissement itératif jusqu'à épuisement du budget,
+    au lieu de l'échelle fixe de profondeur selon le nombre de cases vides.
+    À budget illimité, la recherche est déterministe : même board -> même coup.
+    """
+    if not isinstance(board, int):
+        board = to_bitboard(board)
+
+    max_cost = max_prob_cost(prob_threshold)
+    
+    legal_moves = []
+    for direction, func in MOVES.items():
+        outcome = func(board)
+        if outcome != board:
+            legal_moves.append((direction, outcome))
+    
+    if not legal_moves:
+        return None
+
+    if time_budget is None:
+        empty_len = count_empty(board)
+        
+        # Ajustement dynamique de la profondeur vs vitesse
+        if empty_len >= 8:
+            search_depth = 2
+        elif empty_len >= 4:
+            search_depth = 3
+        else:
+            search_depth = 4 # Mode survie (ton cas actuel)
+
+        scores = _score_moves(legal_moves, search_depth, table, max_cost, searcher, None)
+        return _pick_best(legal_moves, scores)
+
+    # Approfondissement itératif. Chaque itération cherche d'abord le meilleur coup de la
+    # précédente : si le temps manque ensuite, les coups finis à la nouvelle profondeur l'incluent
+    # et le meilleur d'entre eux est gardé (les scores de profondeurs différentes ne se comparent pas)
+    deadline = time.time() + time_budget
+    best_move = legal_moves[0][0]
+    for depth in range(1, MAX_SEARCH_DEPTH + 1):
+        started = time.time()
+        scores = _score_moves_until(legal_moves, depth, table, max_cost, searcher, deadline)
+        if scores:
+            best_move = _pick_best(legal_moves[:len(scores)], scores)
+        if len(scores) < len(legal_moves):
+            break
+
+        best = next(i for i, (direction, _) in enumerate(legal_moves) if direction == best_move)
+        legal_moves.insert(0, legal_moves.pop(best))
+
+        # Chaque itération coûte plus cher que la précédente : inutile d'en lancer
+        # une qu'on n'aura pas le temps de finir
+        now = time.time()
+        if now + (now - started) > deadline:
+            break
+
+    return best_move
+
+def speculate(afterstate, pending, searcher=None, time_budget=None):
+    """
+    Tant que la requête `pending` (Future du coup envoyé) est en vol, calcule le meilleur
+    coup des plateaux que le serveur peut renvoyer : `afterstate` + une tuile. Retourne
+    {bitboard: coup} dès que la réponse est arrivée : chaque recherche tourne sous
+    abort_scope(pending.done) et s'interrompt en cours de route (SearchAborted), son coup
+    partiel n'est pas gardé. Les recherches finies remplissent aussi le cache de transposition.
+    """
+    answers = {}
+    # Le serveur tire la case uniformément : chaque 2 (0.9 / n) est plus probable que
+    # n'importe quel 4 (0.1 / n), l'ordre entre cases d'une même valeur est indifférent
+    cells = empty_cells(afterstate)
+    with abort_scope(pending.done):
+        for exp in (1, 2):
+            for shift in cells:
+                if pending.done():
+                    return answers
+                board = afterstate | (exp << shift)
+                try:
+                    answers[board] = get_best_move(board, searcher=searcher, time_budget=time_budget)
+                except SearchAborted:
+                    return answers
+    return answers
+
 # --- API Interaction ---
 
 def check_active_game():
     url = f"{BASE_URL}/active-game"
     print(f"Checking for active game via {url}...")
-    headers = HEADERS.copy()
     try:
-        response = requests.get(url, headers=headers, cookies=COOKIES, timeout=5)
+        response = SESSION.get(url)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -241,10 +451,8 @@ def check_active_game():
 def start_game():
     url = f"{BASE_URL}/new-game"
     print(f"Starting new game via {url}...")
-    headers = HEADERS.copy()
-    headers['content-length'] = '0'
     try:
-        response = requests.post(url, headers=headers, cookies=COOKIES, timeout=5)
+        response = SESSION.post(url, headers={'content-length': '0'})
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -255,7 +463,7 @@ def make_api_move(game_id, direction):
     url = f"{BASE_URL}/{game_id}/move"
     data = {"direction": direction}
     try:
-        response = requests.post(url, headers=HEADERS, cookies=COOKIES, json=data, timeout=5)
+        response = SESSION.post(url, json=data)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -289,7 +497,16 @@ def print_game_board(board_data, score, paused=False, delay=1.0, last_move=None)
         s = sidebar[i] if i < len(sidebar) else ""
         print(f"{l:<25} {s}")
 
-def main():
+def main(workers=0, split="chance", budget_ms=None, evaluator="heuristic", speculative=False):
+    """
+    Boucle de jeu sur l'API.
+    `workers` > 0 active la recherche parallèle sur un pool persistant de processus
+    (`split` : "root" ou "chance", voir hypnos.twothousandfortyeight.parallel).
+    `budget_ms` : temps de réflexion par coup (approfondissement itératif).
+    `evaluator` : "heuristic" ou "ntuple" (réseau entraîné par `hypnos 2048 train`).
+    `speculative` : pendant l'aller-retour réseau d'un coup, précalcule la réponse aux
+    plateaux post-spawn probables (voir speculate) pour masquer le temps de recherche.
+    """
     if not AUTH_TOKEN or not CSRF_TOKEN:
         print("Error: Tokens not found in .env file.")
         return
@@ -320,8 +537,23 @@ def main():
 
     game_id = game_data['game_id']
     board = game_data['board']
+    # Nouvelle partie : on repart d'un cache vide, conservé ensuite de tour en tour
+    TRANSPOSITION_TABLE.clear()
     score = game_data['score']
 
+    set_evaluator(evaluator)
+    time_budget = budget_ms / 1000 if budget_ms else None
+    searcher = None
+    if workers:
+        from hypnos.twothousandfortyeight.parallel import ParallelSearcher
+        searcher = ParallelSearcher(workers, split, evaluator)
+        print(f"Parallel search: {searcher.workers} workers (split={split})")
+
+    # Un seul thread : la requête /move part pendant que le thread principal cherche
+    http = ThreadPoolExecutor(max_workers=1) if speculative else None
+    answers = {}
+    speculation_hits = ai_moves = 0
+
     delay = 1.0
     paused = False
     last_ai_move_time = 0
@@ -332,6 +564,7 @@ def main():
 
     while True:
         manual_move = None
+        move_to_execute = None
         if msvcrt.kbhit():
             key = msvcrt.getch()
             if key in (b'\x00', b'\xe0'):
@@ -362,14 +595,28 @@ def main():
         if manual_move:
             move_to_execute = manual_move
         elif not paused and (delay <= 0 or (time.time() - last_ai_move_time >= delay)):
-            move_to_execute = get_best_move(board)
+            bitboard = to_bitboard(board)
+            ai_moves += 1
+            if answers.get(bitboard):
+                move_to_execute = answers[bitboard]
+                speculation_hits += 1
+            else:
+                move_to_execute = get_best_move(bitboard, searcher=searcher, time_budget=time_budget)
+            answers = {}
             if not move_to_execute:
                 print("AI found no valid moves. Game might be over.")
             last_ai_move_time = time.time()
 
         if move_to_execute:
             last_move = move_to_execute
-            new_state = make_api_move(game_id, move_to_execute)
+            if http:
+                pending = http.submit(make_api_move, game_id, move_to_execute)
+                if not paused:
+                    afterstate = MOVES[move_to_execute](to_bitboard(board))
+                    answers = speculate(afterstate, pending, searcher, time_budget)
+                new_state = pending.result()
+            else:
+                new_state = make_api_move(game_id, move_to_execute)
             if new_state:
                 board = new_state['board']
                 score = new_state['score']
@@ -377,11 +624,21 @@ def main():
                 if new_state.get('game_over'):
                     print("\nGAME OVER!")
                     print("YOU WON!" if new_state.get('won') else f"Final Score: {score}")
+                    stats = TRANSPOSITION_TABLE.stats()
+                    print(f"Cache: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.1%})")
+                    if http:
+                        print(f"Speculation: {speculation_hits}/{ai_moves} moves precomputed")
                     break
             else:
                 print("Sync error, retrying...")
 
         time.sleep(0.001)
 
+    if searcher:
+        searcher.close()
+    if http:
+        http.shutdown()
+    SESSION.log_metrics()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Transposition table for the 2048 expectimax search.
+
+The same position is reached again and again through different move orders
+and spawn sequences. The table caches the value of a node keyed by
+(bitboard, remaining depth, node type, pruning state), bounded in size with
+LRU eviction.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Bits de prob_cost et de max_cost dans la clé (voir solve.max_prob_cost, qui refuse les seuils au-delà)
+COST_BITS = 16
+MAX_COST = (1 << COST_BITS) - 1
+
+
+class TranspositionTable:
+    """
+    Cache borné de valeurs de noeuds expectimax.
+
+    - Éviction LRU : une entrée relue repasse en tête, la plus ancienne sort.
+    - Sensible à la profondeur : les noeuds de profondeur < `min_depth` ne
+      sont jamais stockés. Ils coûtent moins cher à recalculer qu'à chercher
+      et ils chasseraient du cache les sous-arbres profonds, qui comptent vraiment.
+    """
+
+    def __init__(self, capacity: int = 200_000, min_depth: int = 2):
+        self.capacity = capacity
+        self.min_depth = min_depth
+        self._entries: "OrderedDict[int, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(board: int, depth: int, is_player_turn: bool,
+                 prob_cost: int = 0, fours: int = 0, max_cost: int = 0) -> int:
+        """
+        Packs the node identity in one int. `prob_cost`, `fours` and `max_cost`
+        are part of the key because they decide where the subtree gets pruned.
+        Both costs must fit in COST_BITS (prob_cost <= max_cost <= MAX_COST).
+        """
+        return ((board << (10 + 2 * COST_BITS)) | (max_cost << (10 + COST_BITS)) | (prob_cost << 10)
+                | (fours << 7) | (depth << 1) | int(is_player_turn))
+
+    def get(self, key: int) -> Optional[float]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: int, value: float) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,149 @@
+"""
+Self-play tuning of the 2048 heuristic weights.
+
+A simple evolution strategy searches the heuristic parameters against the
+offline simulator. Each generation samples a population around the current
+mean, plays the same seeded games with every candidate (common random numbers,
+so candidates are compared on identical spawn sequences) and moves the mean
+towards the best quarter.
+
+Games are spread over a process pool. Fitness is cached per (rounded)
+parameter vector, so elites and re-sampled points are never replayed. The best
+weight set so far is written to data/weights.json after every generation;
+heuristic.py loads it at startup.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from hypnos.twothousandfortyeight import heuristic
+from hypnos.twothousandfortyeight.bench import play_game
+
+# Espace de recherche : base du snake en linéaire, les autres poids en log10
+# (ils doivent se mesurer à des termes snake de l'ordre de base**20).
+PARAMS = ("snake_base", "log_empty", "log_monotonicity", "log_merge")
+BOUNDS = np.array([
+    [1.5, 6.0],
+    [0.0, 16.0],
+    [-1.0, 16.0],
+    [-1.0, 16.0],
+])
+INITIAL_SIGMA = np.array([0.5, 2.0, 2.0, 2.0])
+SIGMA_DECAY = 0.9
+# Un log10 sous ce seuil signifie "terme désactivé" (poids 0)
+LOG_OFF = 0.0
+
+ParamKey = Tuple[float, ...]
+
+
+def to_weights(vector) -> Dict[str, float]:
+    snake_base, log_empty, log_mono, log_merge = vector
+    return {
+        "snake_base": float(snake_base),
+        "empty_weight": float(10.0 ** log_empty),
+        "monotonicity_weight": float(10.0 ** log_mono) if log_mono > LOG_OFF else 0.0,
+        "merge_weight": float(10.0 ** log_merge) if log_merge > LOG_OFF else 0.0,
+    }
+
+
+def from_weights(weights: Dict[str, float]) -> np.ndarray:
+    def log_or_off(value):
+        return math.log10(value) if value > 0 else LOG_OFF - 1.0
+    return np.array([
+        weights["snake_base"],
+        log_or_off(weights["empty_weight"]),
+        log_or_off(weights["monotonicity_weight"]),
+        log_or_off(weights["merge_weight"]),
+    ])
+
+
+def param_key(vector) -> ParamKey:
+    return tuple(round(float(v), 3) for v in vector)
+
+
+_worker_key: Optional[ParamKey] = None
+
+
+def _play_with(key: ParamKey, seed: int, max_moves: Optional[int], budget_ms: Optional[float]) -> int:
+    global _worker_key
+    if key != _worker_key:
+        # Reconstruire les tables coûte ~50 ms : seulement quand le candidat change
+        heuristic.set_weights(**to_weights(key))
+        _worker_key = key
+    return play_game(seed, budget_ms=budget_ms, max_moves=max_moves)["score"]
+
+
+class Tuner:
+    def __init__(self, games: int = 8, seed: int = 0, workers: int = 0,
+                 max_moves: Optional[int] = None, budget_ms: Optional[float] = None):
+        """
+        `budget_ms` = None joue avec l'échelle de profondeur fixe : les parties sont alors
+        déterministes et la fitness ne dépend pas de la charge de la machine.
+        """
+        self.seeds = list(range(seed, seed + games))
+        self.seed = seed
+        self.workers = workers
+        self.max_moves = max_moves
+        self.budget_ms = budget_ms
+        self.cache: Dict[ParamKey, float] = {}
+
+    def evaluate(self, pool, vectors: List[np.ndarray]) -> List[float]:
+        """Fitness (score moyen sur les parties de référence), en cache par vecteur."""
+        keys = [param_key(v) for v in vectors]
+        todo = list(dict.fromkeys(k for k in keys if k not in self.cache))
+        tasks = [(k, s, self.max_moves, self.budget_ms) for k in todo for s in self.seeds]
+        if pool is not None:
+            scores = list(pool.map(_play_with, *zip(*tasks), chunksize=len(self.seeds))) if tasks else []
+        else:
+            scores = [_play_with(*t) for t in tasks]
+        for i, key in enumerate(todo):
+            chunk = scores[i * len(self.seeds):(i + 1) * len(self.seeds)]
+            self.cache[key] = float(np.mean(chunk))
+        return [self.cache[k] for k in keys]
+
+    def run(self, generations: int = 10, population: int = 12) -> Tuple[Dict[str, float], float]:
+        rng = np.random.default_rng(self.seed)
+        mean = np.clip(from_weights(heuristic.get_weights()), BOUNDS[:, 0], BOUNDS[:, 1])
+        sigma = INITIAL_SIGMA.copy()
+        elite_count = max(1, population // 4)
+        best_vector, best_fitness = mean, -math.inf
+
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            for generation in range(1, generations + 1):
+                samples = rng.normal(size=(population - 1, len(PARAMS))) * sigma + mean
+                vectors = [mean] + list(np.clip(samples, BOUNDS[:, 0], BOUNDS[:, 1]))
+                fitness = self.evaluate(pool, vectors)
+
+                order = np.argsort(fitness)[::-1]
+                if fitness[order[0]] > best_fitness:
+                    best_fitness = fitness[order[0]]
+                    best_vector = vectors[order[0]]
+                    heuristic.set_weights(**to_weights(best_vector))
+                    heuristic.save_weights(fitness=best_fitness, games=len(self.seeds), generation=generation)
+
+                # Moyenne pondérée (rangs) de l'élite
+                ranks = np.log(elite_count + 0.5) - np.log(np.arange(1, elite_count + 1))
+                ranks /= ranks.sum()
+                mean = np.sum([ranks[i] * vectors[j] for i, j in enumerate(order[:elite_count])], axis=0)
+                sigma *= SIGMA_DECAY
+
+                print(f"Generation {generation}/{generations}: best {fitness[order[0]]:.0f}, "
+                      f"overall {best_fitness:.0f}, cache {len(self.cache)} vectors")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return to_weights(best_vector), best_fitness
+
+
+def main(generations: int = 10, population: int = 12, games: int = 8, seed: int = 0, workers: int = 0,
+         max_moves: Optional[int] = None, budget_ms: Optional[float] = None) -> None:
+    print(f"Tuning heuristic: {generations} generations x {population} candidates x {games} games "
+          f"(seed={seed}, workers={workers or 1})")
+    weights, fitness = Tuner(games, seed, workers, max_moves, budget_ms).run(generations, population)
+    print(f"Best mean score {fitness:.0f} with {weights}")
+    print(f"Saved to {heuristic.WEIGHTS_FILE}")
@@ -0,0 +1,110 @@
+"""
+Offline benchmark of the Wordle solver.
+
+Plays one game per hidden word (every word of a given length, or a seeded
+sample of them) against the offline referee, spread over a process pool,
+with the same strategy as live play: opening book, then entropy search with
+the DB's known solutions as priors. Reports the average number of guesses,
+the guess distribution, the failure rate and the guess-selection latency.
+"""
+
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from hypnos.wordle.book import get_book
+from hypnos.wordle.db import WordleDB
+from hypnos.wordle.engine import WordleEngine
+from hypnos.wordle.simulator import MAX_ATTEMPTS, WordleGame
+
+# Parties envoyées à la fois à chaque processus
+CHUNK_SIZE = 16
+
+_db: Optional[WordleDB] = None
+
+
+def get_db() -> WordleDB:
+    """DB chargée une fois par processus (lecture seule : le bench n'enregistre rien)."""
+    global _db
+    if _db is None:
+        _db = WordleDB.load()
+    return _db
+
+
+def play_game(answer: str) -> Dict:
+    """Joue une partie contre l'arbitre local et retourne ses statistiques."""
+    engine = WordleEngine(len(answer), get_db())
+    game = WordleGame(answer)
+    latencies: List[float] = []
+    while not game.game_over:
+        started = time.perf_counter()
+        guess_word = engine.next_guess()
+        latencies.append(time.perf_counter() - started)
+        _, res = game.guess(guess_word)
+        engine.update(guess_word, res["result"])
+    return {"word": answer, "won": game.won, "guesses": game.attempts, "latencies": latencies}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(results: List[Dict], wall_time: float) -> Dict:
+    latencies = [lat for r in results for lat in r["latencies"]]
+    won = [r["guesses"] for r in results if r["won"]]
+    failed = [r["word"] for r in results if not r["won"]]
+    return {
+        "games": len(results),
+        "wall_time": wall_time,
+        "guesses_mean": statistics.fmean(won) if won else 0.0,
+        "distribution": dict(sorted(Counter(won).items())),
+        "failure_rate": len(failed) / len(results) if results else 0.0,
+        "failed": failed,
+        "latency_mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "latency_p50_ms": _percentile(latencies, 50) * 1000,
+        "latency_p99_ms": _percentile(latencies, 99) * 1000,
+        "latency_max_ms": max(latencies, default=0.0) * 1000,
+    }
+
+
+def run_bench(length: int = 5, workers: int = 0, limit: Optional[int] = None, seed: int = 0) -> Dict:
+    """Une partie par mot de `length` lettres (ou `limit` mots tirés avec `seed`), sur `workers` processus."""
+    # Table, DB et livre chargés avant le fork : partagés par les processus
+    engine = WordleEngine(length, get_db())
+    get_book()
+    answers = [engine.table.words[i] for i in engine.candidates]
+    if limit is not None and limit < len(answers):
+        answers = sorted(random.Random(seed).sample(answers, limit))
+    started = time.perf_counter()
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(play_game, answers, chunksize=CHUNK_SIZE))
+    else:
+        results = [play_game(a) for a in answers]
+    return summarize(results, time.perf_counter() - started)
+
+
+def print_report(report: Dict) -> None:
+    print(f"Games: {report['games']} in {report['wall_time']:.1f}s")
+    print(f"Guesses: mean {report['guesses_mean']:.3f} (won games), failure rate {report['failure_rate']:.2%}")
+    total = report["games"] or 1
+    distribution = ", ".join(f"{n}: {count / total:.1%}" for n, count in report["distribution"].items())
+    print(f"Distribution: {distribution}, X: {report['failure_rate']:.1%}")
+    print(f"Guess latency: mean {report['latency_mean_ms']:.1f} ms, p50 {report['latency_p50_ms']:.1f} ms, "
+          f"p99 {report['latency_p99_ms']:.1f} ms, max {report['latency_max_ms']:.1f} ms")
+    if report["failed"]:
+        shown = ", ".join(report["failed"][:20])
+        print(f"Failed ({len(report['failed'])}): {shown}{', ...' if len(report['failed']) > 20 else ''}")
+
+
+def main(length: int = 5, workers: int = 0, limit: Optional[int] = None, seed: int = 0) -> None:
+    print(f"Benchmarking {length}-letter words ({limit or 'all'}), workers={workers or 1}, "
+          f"{MAX_ATTEMPTS} attempts per game...")
+    print_report(run_bench(length, workers, limit, seed))
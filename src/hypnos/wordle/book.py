@@ -0,0 +1,141 @@
+"""
+Opening book for Wordle.
+
+The first two guesses of a game only depend on the word length and on the
+DB, so they are computed offline by `hypnos wordle build-book`. For every
+length of mots.txt, the book holds the best first guess and, for every
+feedback that first guess can get (leaving more than two candidates), the
+best second guess. Both come from the same entropy search as live play
+(hypnos.wordle.entropy).
+
+The book is a small JSON file (data/opening_book.json); a lookup during a
+game is two dict accesses. Each length is stored with the key of its inputs
+(hash of mots.txt, known solutions and rejected words of that length, like
+the dictionary index cache): once the dictionary or the DB has changed for a
+length, its entry is ignored and the engine searches live until the book is
+rebuilt.
+"""
+
+import json
+import time
+from importlib import resources
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hypnos.lib import setup_logger
+from hypnos.wordle.db import WordleDB
+from hypnos.wordle.dictionary import load_words_by_length, source_hash
+from hypnos.wordle.entropy import best_guess, solution_priors
+from hypnos.wordle.patterns import get_table, words_hash
+
+logger = setup_logger("wordle_book")
+
+DATA_PATH = resources.files("hypnos.wordle.data")
+BOOK_FILE = DATA_PATH / "opening_book.json"
+
+# (guess, code du feedback) des tours déjà joués
+History = Sequence[Tuple[str, int]]
+
+
+def book_key(length: int, solutions: Iterable[str], invalid: Iterable[str]) -> str:
+    """Empreinte des entrées d'une longueur : mots.txt, solutions connues et mots refusés."""
+    return words_hash([source_hash(), str(length), *sorted(solutions), "", *sorted(invalid)])
+
+
+class OpeningBook:
+    def __init__(self, entries: Optional[Dict[int, dict]] = None):
+        # {longueur: {"key": book_key, "first": mot, "second": {code: mot}}}
+        self.entries = entries or {}
+        self._stale = set()
+
+    @classmethod
+    def load(cls, path=BOOK_FILE) -> "OpeningBook":
+        """Livre vide si le fichier n'existe pas (le solveur calcule alors tout en direct)."""
+        if not path.exists():
+            return cls()
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls({
+            int(length): {"key": entry.get("key"), "first": entry["first"],
+                          "second": {int(code): word for code, word in entry["second"].items()}}
+            for length, entry in data.items()
+        })
+
+    def save(self, path=BOOK_FILE) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({str(length): entry for length, entry in self.entries.items()}, f,
+                      separators=(",", ":"), sort_keys=True)
+
+    def lookup(self, length: int, history: History, key: str) -> Optional[str]:
+        """
+        Guess du livre pour ce début de partie, None si on en est sorti ou si l'entrée
+        a été calculée sur d'autres données (`key` : book_key du dictionnaire et de la DB).
+        """
+        entry = self.entries.get(length)
+        if entry is None:
+            return None
+        if entry["key"] != key:
+            if length not in self._stale:
+                self._stale.add(length)
+                logger.info(f"Opening book out of date for length {length} (dictionary or DB changed), "
+                            f"searching live. Run `hypnos wordle build-book` to refresh it.")
+            return None
+        if not history:
+            return entry["first"]
+        if len(history) == 1 and history[0][0] == entry["first"]:
+            return entry["second"].get(history[0][1])
+        return None
+
+
+_book: Optional[OpeningBook] = None
+
+
+def get_book() -> OpeningBook:
+    """Livre chargé une seule fois par processus."""
+    global _book
+    if _book is None:
+        _book = OpeningBook.load()
+    return _book
+
+
+def build_entry(words: Sequence[str], solutions: Sequence[str], key: Optional[str] = None) -> dict:
+    """Premier guess et second guess par feedback, pour une liste de mots de même longueur."""
+    table = get_table(words, extra=solutions)
+    priors = solution_priors(table, solutions)
+    candidates = np.arange(len(table.words))
+    first = best_guess(table, candidates, priors)
+
+    codes = np.asarray(table.row(table.words[first]))
+    second = {}
+    for code in np.unique(codes):
+        group = candidates[codes == code]
+        if len(group) <= 2:
+            continue  # Réponse (presque) connue : best_guess la joue directement
+        second[int(code)] = table.words[best_guess(table, group, priors)]
+    return {"key": key, "first": table.words[first], "second": second}
+
+
+def build_book(lengths: Optional[Iterable[int]] = None) -> OpeningBook:
+    db = WordleDB.load()
+    invalid = db.invalid_words
+    by_length = load_words_by_length()
+    book = OpeningBook()
+    for length in lengths or by_length:
+        started = time.time()
+        solutions = sorted(w for w in db.solutions if len(w) == length and w not in invalid)
+        words = [w for w in by_length.get(length, []) if w not in invalid]
+        if not words and not solutions:
+            continue
+        key = book_key(length, solutions, (w for w in invalid if len(w) == length))
+        book.entries[length] = build_entry(words, solutions, key)
+        entry = book.entries[length]
+        print(f"Length {length}: {len(set(words) | set(solutions))} words, first guess {entry['first']}, "
+              f"{len(entry['second'])} second guesses ({time.time() - started:.1f}s)")
+    return book
+
+
+def main() -> None:
+    book = build_book()
+    book.save()
+    print(f"Saved to {BOOK_FILE}")
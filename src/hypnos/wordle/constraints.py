@@ -0,0 +1,85 @@
+"""
+Letter constraints accumulated over the feedback of a game.
+
+The state is, for every position, a bitmask of the symbols still allowed
+there, and for every symbol a minimum and maximum count in the answer:
+
+- `correct`: the position only allows that symbol;
+- `present` / `absent`: the symbol is excluded from that position;
+- per symbol of the guess, `correct` + `present` tiles give a lower bound on
+  its count, and any `absent` tile of it makes that lower bound exact (upper
+  bound), which is how repeated letters are handled.
+
+Each guess tightens the state in O(length). It is checked against the
+symbol-count matrix of many words at once (one NumPy pass), and can count
+violated constraints instead of rejecting, which ranks words by how close
+they are to every feedback seen so far. For words of the pattern table the
+exact test gives the same result as matching the feedback codes.
+
+Words are upper-case ASCII: symbols are the 64 codes from ' ' (32) to '_' (95).
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+from hypnos.wordle.patterns import encode_words
+
+SYMBOL_OFFSET = 32
+SYMBOLS = 64
+ALL_SYMBOLS = np.uint64(2 ** SYMBOLS - 1)
+
+
+def symbol_indices(encoded: np.ndarray) -> np.ndarray:
+    """Codes ASCII (uint8) -> indices de symbole 0..63."""
+    return encoded.astype(np.int64) - SYMBOL_OFFSET
+
+
+def symbol_counts(encoded: np.ndarray) -> np.ndarray:
+    """Matrice (mots x SYMBOLS) du nombre d'occurrences de chaque symbole."""
+    n, length = encoded.shape
+    counts = np.zeros((n, SYMBOLS), dtype=np.uint8)
+    rows = np.repeat(np.arange(n), length)
+    np.add.at(counts, (rows, symbol_indices(encoded).ravel()), 1)
+    return counts
+
+
+class Constraints:
+    def __init__(self, length: int):
+        self.length = length
+        self.allowed = np.full(length, ALL_SYMBOLS, dtype=np.uint64)
+        self.min_count = np.zeros(SYMBOLS, dtype=np.uint8)
+        self.max_count = np.full(SYMBOLS, length, dtype=np.uint8)
+
+    def update(self, guess: str, result: Sequence[str]) -> None:
+        """Resserre l'état avec le feedback `result` obtenu pour `guess`."""
+        symbols = symbol_indices(encode_words([guess])[0])
+        hits = np.zeros(SYMBOLS, dtype=np.uint8)
+        capped = np.zeros(SYMBOLS, dtype=bool)
+        for position, (symbol, status) in enumerate(zip(symbols, result)):
+            bit = np.uint64(1) << np.uint64(symbol)
+            if status == "correct":
+                self.allowed[position] = bit
+                hits[symbol] += 1
+            else:
+                self.allowed[position] &= ~bit
+                if status == "present":
+                    hits[symbol] += 1
+                else:
+                    capped[symbol] = True
+        np.maximum(self.min_count, hits, out=self.min_count)
+        self.max_count[capped] = np.minimum(self.max_count[capped], hits[capped])
+
+    def violations(self, encoded: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Nombre de contraintes violées par chaque mot : positions interdites plus
+        symboles hors de [min, max]. `encoded` / `counts` : encode_words / symbol_counts.
+        """
+        bits = np.left_shift(np.uint64(1), symbol_indices(encoded).astype(np.uint64))
+        bad_positions = (bits & self.allowed) == 0
+        bad_counts = (counts < self.min_count) | (counts > self.max_count)
+        return np.count_nonzero(bad_positions, axis=1) + np.count_nonzero(bad_counts, axis=1)
+
+    def matches(self, encoded: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Masque des mots compatibles avec tous les feedbacks."""
+        return self.violations(encoded, counts) == 0
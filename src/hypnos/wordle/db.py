@@ -0,0 +1,125 @@
+"""
+Wordle DB (data/wordle_db.json): solutions seen in past games and words
+rejected by the API.
+
+In memory the DB is two sets, so membership tests are O(1) however large it
+grows. New entries are appended to a journal (data/wordle_db.journal, one
+"kind<TAB>word" line each) instead of rewriting the JSON file. The journal is
+replayed at load time and compacted into the JSON file every COMPACT_EVERY
+entries and on close.
+"""
+
+import json
+import os
+from importlib import resources
+from typing import Dict, List
+
+from hypnos.lib import setup_logger
+
+logger = setup_logger("wordle_db")
+
+DATA_PATH = resources.files("hypnos.wordle.data")
+DATA_FILE = DATA_PATH / "wordle_db.json"
+JOURNAL_FILE = DATA_PATH / "wordle_db.journal"
+
+SOLUTION = "solution"
+INVALID = "invalid"
+
+# Entrées du journal avant réécriture du JSON
+COMPACT_EVERY = 50
+
+
+class WordleDB:
+    def __init__(self, path=DATA_FILE, journal_path=JOURNAL_FILE):
+        self.path = path
+        self.journal_path = journal_path
+        self.solutions: set = set()
+        self.invalid_words: set = set()
+        self.pending = 0
+
+    @classmethod
+    def load(cls, path=DATA_FILE, journal_path=JOURNAL_FILE) -> "WordleDB":
+        db = cls(path, journal_path)
+        data = load_db(path)
+        db.solutions.update(data.get("solutions", []))
+        db.invalid_words.update(data.get("invalid_words", []))
+        db._replay()
+        return db
+
+    def _replay(self) -> None:
+        if not self.journal_path.exists():
+            return
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                kind, _, word = line.rstrip("\n").partition("\t")
+                if not word:
+                    continue  # Ligne tronquée (arrêt pendant une écriture)
+                if kind == SOLUTION:
+                    self.solutions.add(word)
+                elif kind == INVALID:
+                    self.invalid_words.add(word)
+                self.pending += 1
+
+    def _append(self, kind: str, word: str) -> None:
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(f"{kind}\t{word}\n")
+        self.pending += 1
+        if self.pending >= COMPACT_EVERY:
+            self.compact()
+
+    def add_solution(self, word: str) -> bool:
+        """Enregistre une solution. False si elle était déjà connue."""
+        if word in self.solutions:
+            return False
+        self.solutions.add(word)
+        self._append(SOLUTION, word)
+        return True
+
+    def add_invalid(self, word: str) -> bool:
+        """Enregistre un mot refusé par l'API. False s'il était déjà connu."""
+        if word in self.invalid_words:
+            return False
+        self.invalid_words.add(word)
+        self._append(INVALID, word)
+        return True
+
+    def record(self, kind: str, word: str) -> bool:
+        """add_solution ou add_invalid selon `kind` (hook de WordleEngine)."""
+        if kind == SOLUTION:
+            return self.add_solution(word)
+        if kind == INVALID:
+            return self.add_invalid(word)
+        raise ValueError(f"Unknown DB entry kind: {kind}")
+
+    def compact(self) -> None:
+        """Réécrit le JSON avec tout le contenu (remplacement atomique) puis vide le journal."""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"solutions": sorted(self.solutions), "invalid_words": sorted(self.invalid_words)},
+                      f, indent=4)
+        os.replace(tmp, self.path)
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self.pending = 0
+
+    def close(self) -> None:
+        if self.pending:
+            self.compact()
+
+    def __enter__(self) -> "WordleDB":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_db(path=DATA_FILE) -> Dict[str, List[str]]:
+    """Contenu brut du fichier JSON (sans le journal)."""
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load DB: {e}")
+            return {"solutions": [], "invalid_words": []}
+    return {"solutions": [], "invalid_words": []}
@@ -0,0 +1,102 @@
+"""
+Dictionary of guessable words (data/mots.txt), normalized to upper case
+without accents.
+
+Normalizing the 22k lines of mots.txt is only done once: the words are
+stored in data/cache/dictionary_<hash>/ as one fixed-width byte array
+(.npy, dtype S<length>) per word length, sorted and deduplicated. The
+directory is named by the hash of mots.txt, so editing the source rebuilds
+the index. Later runs memory-map the arrays, and loading the words of one
+length costs a dict access.
+"""
+
+import hashlib
+import shutil
+import unicodedata
+from importlib import resources
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from hypnos.lib import setup_logger
+
+logger = setup_logger("wordle_dictionary")
+
+DATA_PATH = resources.files("hypnos.wordle.data")
+DICT_FILE = "mots.txt"
+CACHE_PATH = DATA_PATH / "cache"
+
+
+def remove_accents(input_str: str) -> str:
+    nfkd_form = unicodedata.normalize('NFKD', input_str)
+    return "".join([c for c in nfkd_form if not unicodedata.combining(c)]).upper()
+
+
+def _read_words() -> List[str]:
+    for encoding in ("utf-8", "latin-1"):
+        try:
+            with (DATA_PATH / DICT_FILE).open("r", encoding=encoding) as f:
+                return [remove_accents(w) for w in (line.strip() for line in f) if w]
+        except (FileNotFoundError, UnicodeDecodeError) as e:
+            logger.warning(f"Error reading dictionary {encoding}: {e}")
+    logger.error("Failed to load dictionary")
+    return []
+
+
+def source_hash() -> str:
+    try:
+        return hashlib.sha1((DATA_PATH / DICT_FILE).read_bytes()).hexdigest()[:16]
+    except FileNotFoundError:
+        return "missing"
+
+
+def build_index(directory) -> None:
+    """Écrit un tableau d'octets trié par longueur de mot dans `directory` (remplacé en bloc)."""
+    by_length: Dict[int, set] = {}
+    for w in _read_words():
+        if not w.isascii():
+            logger.warning(f"Skipping non-ASCII word after normalization: {w}")
+            continue
+        by_length.setdefault(len(w), set()).add(w)
+
+    tmp = directory.with_name(directory.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for length, words in by_length.items():
+        np.save(tmp / f"words_{length}.npy", np.array(sorted(words), dtype=f"S{length}"))
+    # Les index construits pour une autre version de mots.txt ne servent plus
+    for stale in directory.parent.glob("dictionary_*"):
+        if stale != tmp:
+            shutil.rmtree(stale, ignore_errors=True)
+    tmp.rename(directory)
+
+
+_index: Optional[Dict[int, np.ndarray]] = None
+
+
+def load_index() -> Dict[int, np.ndarray]:
+    """{longueur: tableau S<longueur> mappé en mémoire}, construit au premier appel si besoin."""
+    global _index
+    if _index is None:
+        directory = CACHE_PATH / f"dictionary_{source_hash()}"
+        if not directory.exists():
+            logger.info(f"Building dictionary index in {directory}...")
+            build_index(directory)
+        _index = {
+            int(path.stem.split("_")[1]): np.load(path, mmap_mode="r")
+            for path in sorted(directory.glob("words_*.npy"))
+        }
+    return _index
+
+
+def load_words_by_length() -> Dict[int, List[str]]:
+    """Tous les mots, triés et dédoublonnés, par longueur."""
+    return {length: load_dictionary(length) for length in sorted(load_index())}
+
+
+def load_dictionary(length: int) -> List[str]:
+    """Mots de `length` lettres, triés (ordre stable pour les index des tables)."""
+    words = load_index().get(length)
+    if words is None:
+        return []
+    return np.char.decode(words, "ascii").tolist()
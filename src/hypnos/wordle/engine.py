@@ -0,0 +1,138 @@
+"""
+Wordle game engine shared by solve, train, multitrain and bench.
+
+A WordleEngine holds the state of one game: the pattern table of the word
+length (dictionary + known solutions), the remaining candidates, the pool of
+accepted guesses, the solution priors and the history used by the opening
+book. The starting state is built once per length and reused by every game
+until the DB changes for that length. Callers only carry words to and from
+the API (or the offline referee):
+
+    engine = WordleEngine(length, db, on_outcome=db.record)
+    engine.resume(game["board"])
+    guess = engine.next_guess()
+    ... send it, then engine.update(guess, result), engine.reject(guess)
+    or engine.finish(answer)
+
+When the answer is not among the known words, the feedback eventually
+eliminates every candidate. The engine then keeps the words of the pool that
+violate the fewest letter constraints (hypnos.wordle.constraints) as
+candidates instead of dropping the feedback or guessing at random.
+
+`on_outcome(kind, word)` receives every rejected guess (INVALID) and every
+revealed answer (SOLUTION): train writes them to the DB, multitrain queues
+them for its writer task, solve and bench leave it unset.
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hypnos.lib import setup_logger
+from hypnos.wordle.book import book_key, get_book
+from hypnos.wordle.constraints import Constraints, symbol_counts
+from hypnos.wordle.db import INVALID, SOLUTION, WordleDB
+from hypnos.wordle.dictionary import load_dictionary
+from hypnos.wordle.entropy import best_guess, solution_priors
+from hypnos.wordle.patterns import PatternTable, encode_result, get_table
+
+logger = setup_logger("wordle_engine")
+
+MAX_ATTEMPTS = 6
+
+# on_outcome(kind, mot), kind = SOLUTION ou INVALID
+OutcomeHook = Callable[[str, str], None]
+
+# État de départ par longueur : (clé = contenu de la DB pour cette longueur,
+# (table, candidats, priors, clé du livre d'ouverture))
+_initial_states: Dict[int, Tuple[tuple, Tuple[PatternTable, np.ndarray, np.ndarray, str]]] = {}
+
+
+def initial_state(length: int, db: WordleDB) -> Tuple[PatternTable, np.ndarray, np.ndarray, str]:
+    """
+    Table, candidats, priors et book_key de début de partie, recalculés seulement quand
+    la DB change pour cette longueur : les parties suivantes ne paient que le filtrage.
+    """
+    solutions = tuple(sorted(w for w in db.solutions if len(w) == length and w not in db.invalid_words))
+    invalid = tuple(sorted(w for w in db.invalid_words if len(w) == length))
+    key = (solutions, invalid)
+    cached = _initial_states.get(length)
+    if cached is None or cached[0] != key:
+        table = get_table(load_dictionary(length), extra=solutions)
+        # Candidats = indices dans la table des patterns (dictionnaire + solutions connues)
+        candidates = table.indices(w for w in table.words if w not in db.invalid_words)
+        cached = _initial_states[length] = (key, (table, candidates, solution_priors(table, solutions),
+                                                  book_key(length, solutions, invalid)))
+    return cached[1]
+
+
+class WordleEngine:
+    def __init__(self, length: int, db: WordleDB, on_outcome: Optional[OutcomeHook] = None):
+        self.length = length
+        self.on_outcome = on_outcome
+        self.table, self.candidates, self.priors, self.book_key = initial_state(length, db)
+        self.known_solutions = int(np.count_nonzero(self.priors > 1))
+        # Guesses possibles : tous les mots valides, même ceux déjà éliminés comme réponse
+        self.pool = self.candidates
+        # (guess, code du feedback) de chaque tour, pour le livre d'ouverture
+        self.history: List[Tuple[str, int]] = []
+        self.constraints = Constraints(length)
+        self._counts: Optional[np.ndarray] = None
+
+    def resume(self, board: Sequence[Sequence[Dict[str, str]]]) -> None:
+        """Rejoue les tours déjà joués d'une partie reprise (champ `board` de l'API)."""
+        for turn in board:
+            self.update("".join(x['letter'] for x in turn), [x['status'] for x in turn])
+
+    def next_guess(self) -> Optional[str]:
+        """Livre d'ouverture, sinon guess le plus informatif. None s'il ne reste aucun candidat."""
+        if not len(self.candidates):
+            return None
+        booked = get_book().lookup(self.length, self.history, self.book_key)
+        if booked is not None and self.table.index.get(booked, -1) in self.pool:
+            return booked
+        return self.table.words[best_guess(self.table, self.candidates, self.priors, self.pool)]
+
+    def update(self, guess: str, result: Sequence[str]) -> bool:
+        """
+        Filtre les candidats par le feedback. False si aucun mot connu n'est compatible :
+        les candidats sont alors les mots les plus proches de tous les feedbacks.
+        """
+        self.history.append((guess, encode_result(result)))
+        self.constraints.update(guess, result)
+        candidates = self.table.filter(self.candidates, guess, result)
+        if not len(candidates):
+            logger.warning(f"No known word fits the feedback of {guess}, keeping the closest ones.")
+            self.candidates = self._closest()
+            return False
+        self.candidates = candidates
+        return True
+
+    def reject(self, guess: str) -> None:
+        """Mot refusé par l'API : retiré du pool (sinon le même guess serait rejoué)."""
+        self._record(INVALID, guess)
+        rejected = self.table.index.get(guess)
+        self.pool = self.pool[self.pool != rejected]
+        self.candidates = self.candidates[self.candidates != rejected]
+        if not len(self.candidates):
+            self.candidates = self._closest()
+
+    def _closest(self) -> np.ndarray:
+        """Mots du pool (hors guesses joués) violant le moins de contraintes."""
+        if self._counts is None:
+            self._counts = symbol_counts(self.table.encoded)
+        played = self.table.indices(guess for guess, _ in self.history)
+        pool = self.pool[~np.isin(self.pool, played)]
+        if not len(pool):
+            return pool
+        violations = self.constraints.violations(self.table.encoded[pool], self._counts[pool])
+        return pool[violations == violations.min()]
+
+    def finish(self, answer: Optional[str]) -> None:
+        """Fin de partie : la réponse révélée (s'il y en a une) est transmise au hook."""
+        if answer:
+            self._record(SOLUTION, answer)
+
+    def _record(self, kind: str, word: str) -> None:
+        if self.on_outcome is not None:
+            self.on_outcome(kind, word)
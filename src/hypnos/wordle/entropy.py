@@ -0,0 +1,112 @@
+"""
+Guess selection for Wordle.
+
+A guess splits the remaining candidates by the feedback it would produce
+(one row of the PatternTable). Guesses are scored by the entropy of that
+split, in bits, with candidates weighted by a prior: known solutions from
+wordle_db.json are more likely answers than arbitrary dictionary words. The
+probability that the guess is itself the answer is added to the score, so
+among equally informative guesses a possible answer wins.
+
+Pattern histograms are computed for a whole block of guesses at once (one
+np.bincount, or a row-wise sort for long words), without any Python loop over
+words.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+from hypnos.wordle.patterns import PatternTable
+
+# Poids a priori d'une solution déjà vue par rapport à un mot du dictionnaire
+SOLUTION_PRIOR = 20.0
+
+OBJECTIVES = ("entropy", "expected_size")
+
+# Histogrammes denses jusqu'à 8 lettres et tant qu'ils ne sont pas beaucoup plus grands
+# que le nombre de candidats ; tri des lignes sinon
+DENSE_PATTERNS = 3 ** 8
+DENSE_RATIO = 2
+# Taille maximale (guesses x patterns) d'un bloc d'histogrammes denses
+HISTOGRAM_CELLS = 4_000_000
+
+
+def solution_priors(table: PatternTable, solutions: Iterable[str], prior: float = SOLUTION_PRIOR) -> np.ndarray:
+    """Poids de chaque mot de la table : `prior` pour les solutions connues, 1 sinon."""
+    weights = np.ones(len(table.words))
+    weights[table.indices(solutions)] = prior
+    return weights
+
+
+def _dense_masses(codes: np.ndarray, p: np.ndarray, patterns: int):
+    """(ligne, masse) de chaque pattern non vide, par histogrammes denses (3**L petit)."""
+    chunk = max(1, HISTOGRAM_CELLS // patterns)
+    for start in range(0, len(codes), chunk):
+        block = codes[start:start + chunk]
+        rows = len(block)
+        flat = (np.arange(rows)[:, None] * patterns + block).ravel()
+        mass = np.bincount(flat, np.broadcast_to(p, block.shape).ravel(), minlength=rows * patterns)
+        nonzero = np.flatnonzero(mass)
+        yield start + nonzero // patterns, mass[nonzero]
+
+
+def _sorted_masses(codes: np.ndarray, p: np.ndarray):
+    """
+    Même résultat par tri de chaque ligne (3**L trop grand pour un histogramme dense).
+    La classe de poids du candidat est rangée dans les 8 bits bas de la clé : un tri
+    simple suffit, sans argsort.
+    """
+    values, classes = np.unique(p, return_inverse=True)
+    if len(values) > 256:
+        order = np.argsort(codes, axis=1)
+        keys, weights = np.take_along_axis(codes, order, axis=1), p[order]
+    else:
+        packed = np.sort((codes.astype(np.uint64) << np.uint64(8)) | classes.astype(np.uint64), axis=1)
+        keys, weights = packed >> np.uint64(8), values[(packed & np.uint64(0xFF)).astype(np.intp)]
+    new = np.ones(keys.shape, dtype=bool)
+    new[:, 1:] = keys[:, 1:] != keys[:, :-1]
+    starts = np.flatnonzero(new)
+    yield starts // codes.shape[1], np.add.reduceat(weights.ravel(), starts)
+
+
+def score_guesses(table: PatternTable, guesses: np.ndarray, candidates: np.ndarray,
+                  weights: np.ndarray, objective: str = "entropy") -> np.ndarray:
+    """
+    Score de chaque guess (indices dans la table) sur les candidats restants, plus grand = meilleur.
+    "entropy" : information attendue (bits) ; "expected_size" : moins le nombre
+    (pondéré) de candidats attendus après le feedback.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective} (expected one of {OBJECTIVES})")
+    w = weights[candidates]
+    p = w / w.sum()
+    codes = np.asarray(table.matrix[np.ix_(guesses, candidates)])
+    patterns = 3 ** len(table.words[0])
+
+    scores = np.zeros(len(guesses))
+    dense = patterns <= DENSE_PATTERNS and patterns <= DENSE_RATIO * len(candidates)
+    groups = _dense_masses(codes, p, patterns) if dense else _sorted_masses(codes, p)
+    for rows, mass in groups:
+        if objective == "entropy":
+            scores += np.bincount(rows, -mass * np.log2(mass), minlength=len(guesses))
+        else:
+            scores -= np.bincount(rows, mass ** 2, minlength=len(guesses)) * len(candidates)
+
+    # Chance que le guess soit directement la réponse
+    answer_mass = np.zeros(len(table.words))
+    answer_mass[candidates] = p
+    return scores + answer_mass[guesses]
+
+
+def best_guess(table: PatternTable, candidates: np.ndarray, weights: np.ndarray,
+               pool: Optional[np.ndarray] = None, objective: str = "entropy") -> int:
+    """
+    Indice (dans la table) du meilleur guess parmi `pool` (défaut : tous les mots de la table).
+    Avec 1 ou 2 candidats, on joue directement le plus probable.
+    """
+    if len(candidates) <= 2:
+        return int(candidates[np.argmax(weights[candidates])])
+    if pool is None:
+        pool = np.arange(len(table.words))
+    return int(pool[np.argmax(score_guesses(table, pool, candidates, weights, objective))])
@@ -0,0 +1,285 @@
+"""
+Concurrent Wordle training over several accounts.
+
+One asyncio task per account plays games back to back, each with its own
+credentials and its own keep-alive session from hypnos.lib.session (blocking
+calls run in worker threads). All sessions share:
+
+- one DB writer task: new solutions and invalid words go through a queue,
+  so WordleDB is only written from one place;
+- one adaptive rate limiter: requests are spaced by a common interval that
+  shrinks while the API answers and grows on every burst of 429 (honoring
+  Retry-After), pausing every session at once.
+
+Accounts come from the environment (.env): AUTH_TOKEN / CSRF_TOKEN, then
+AUTH_TOKEN_2 / CSRF_TOKEN_2, AUTH_TOKEN_3 / ... `base_url` can point to the
+local stub server (hypnos.wordle.stub) to run the whole driver offline.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import requests
+from dotenv import load_dotenv
+
+from hypnos.lib import setup_logger
+from hypnos.lib.session import (IDEMPOTENT_METHODS, NOT_PROCESSED_STATUSES, backoff_delay, failed_before_send,
+                                get_session, retry_after)
+from hypnos.wordle.db import SOLUTION, WordleDB
+from hypnos.wordle.engine import MAX_ATTEMPTS, WordleEngine
+
+logger = setup_logger("wordle_multitrain")
+
+BASE_URL = "https://play.hypnos2026.fr/api/arg/wordle"
+
+# Pause par session entre deux parties
+COOLDOWN = 13.0
+REQUEST_RETRIES = 5
+
+
+@dataclass
+class Account:
+    name: str
+    auth_token: str
+    csrf_token: str
+
+
+def load_accounts() -> List[Account]:
+    """Comptes définis dans l'environnement : AUTH_TOKEN/CSRF_TOKEN puis suffixes _2, _3, ..."""
+    load_dotenv()
+    accounts = []
+    index = 1
+    while True:
+        suffix = "" if index == 1 else f"_{index}"
+        auth, csrf = os.getenv(f"AUTH_TOKEN{suffix}"), os.getenv(f"CSRF_TOKEN{suffix}")
+        if not auth or not csrf:
+            break
+        accounts.append(Account(f"account{index}", auth, csrf))
+        index += 1
+    return accounts
+
+
+class AdaptiveRateLimiter:
+    """
+    Espacement commun des requêtes de toutes les sessions (AIMD) :
+    l'intervalle diminue de `decrease` à chaque succès et est multiplié par `increase`
+    à chaque 429, avec une pause globale d'au moins Retry-After. Les 429 de requêtes
+    parties avant la dernière hausse ne comptent pas : une rafale = une seule hausse.
+    """
+
+    def __init__(self, interval: float = 0.5, min_interval: float = 0.05, max_interval: float = 30.0,
+                 decrease: float = 0.9, increase: float = 2.0):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.decrease = decrease
+        self.increase = increase
+        self.throttled = 0
+        self._next_slot = 0.0
+        self._last_increase = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Attend le prochain créneau et retourne son heure (à repasser à on_throttle)."""
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return slot
+
+    def on_success(self) -> None:
+        self.interval = max(self.min_interval, self.interval * self.decrease)
+
+    def on_throttle(self, retry_after: Optional[float] = None, sent_at: Optional[float] = None) -> None:
+        self.throttled += 1
+        if sent_at is None or sent_at >= self._last_increase:
+            self.interval = min(self.max_interval, self.interval * self.increase)
+            self._last_increase = time.monotonic()
+        pause = max(retry_after or 0.0, self.interval)
+        self._next_slot = max(self._next_slot, time.monotonic() + pause)
+
+
+class AccountClient:
+    """API Wordle pour un compte, appels bloquants exécutés dans un thread."""
+
+    def __init__(self, account: Account, limiter: AdaptiveRateLimiter, base_url: str = BASE_URL):
+        self.account = account
+        self.limiter = limiter
+        self.base_url = base_url.rstrip("/")
+        # Pas de retries dans la session : ils passent par le limiteur commun
+        self.session = get_session('https://play.hypnos2026.fr/game/wordle/', retries=0,
+                                   cookies={'auth_token': account.auth_token, 'csrf_token': account.csrf_token})
+
+    async def request(self, method: str, path: str, **kwargs) -> Optional[requests.Response]:
+        """
+        Requête avec retries cadencés par le limiteur commun. Un POST n'est rejoué que sur 429 / 503
+        ou si la connexion n'a pas pu s'ouvrir : après un timeout de lecture ou un autre 5xx, le serveur
+        a pu l'appliquer (guess compté), on abandonne (None) et la partie est reprise par /active-game.
+        """
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(REQUEST_RETRIES):
+            sent_at = await self.limiter.acquire()
+            try:
+                response = await asyncio.to_thread(
+                    self.session.request, method, f"{self.base_url}{path}", **kwargs
+                )
+            except requests.RequestException as e:
+                logger.error(f"[{self.account.name}] Request error: {e}")
+                if not idempotent and not failed_before_send(e):
+                    return None
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+            if response.status_code == 429:
+                self.limiter.on_throttle(retry_after(response), sent_at)
+                logger.warning(f"[{self.account.name}] Rate limit hit (429), interval now {self.limiter.interval:.2f}s")
+                continue
+            if response.status_code >= 500:
+                if not idempotent and response.status_code not in NOT_PROCESSED_STATUSES:
+                    logger.error(f"[{self.account.name}] Server error {response.status_code} on {method} {path}, "
+                                 f"not retried (may have been applied)")
+                    return None
+                logger.warning(f"[{self.account.name}] Server error {response.status_code}. Retrying ({attempt+1}/{REQUEST_RETRIES})...")
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+            self.limiter.on_success()
+            return response
+        return None
+
+    async def get_game(self) -> Optional[Dict[str, Any]]:
+        """Partie active du compte, ou nouvelle partie."""
+        response = await self.request('GET', "/active-game")
+        if response is not None and response.status_code == 200:
+            data = response.json()
+            if data.get('has_active_game'):
+                return data.get('game') or data
+        response = await self.request('POST', "/new-game")
+        if response is not None and response.status_code == 200:
+            return response.json()
+        return None
+
+    async def guess(self, game_id: str, word: str) -> Optional[Dict[str, Any]]:
+        response = await self.request('POST', f"/{game_id}/guess", json={'guess': word})
+        if response is None:
+            return None
+        if response.status_code == 400:
+            try:
+                if response.json().get('detail') in ["Not a valid word", "Guess must be X letters"]:
+                    return {"status": "invalid_word"}
+            except ValueError:
+                pass
+        if response.status_code == 200:
+            return response.json()
+        logger.error(f"[{self.account.name}] Error guessing: {response.status_code} - {response.text}")
+        return None
+
+    def close(self) -> None:
+        self.session.close()
+
+
+async def db_writer(db: WordleDB, queue: asyncio.Queue) -> None:
+    """Seul écrivain de la DB : consomme les (kind, mot) envoyés par les sessions."""
+    while True:
+        kind, word = await queue.get()
+        if db.record(kind, word) and kind == SOLUTION:
+            logger.info(f"-> Adding {word} to solutions DB.")
+        queue.task_done()
+
+
+async def play_game(client: AccountClient, db: WordleDB, updates: asyncio.Queue) -> Optional[bool]:
+    """Joue une partie. True/False = gagnée/perdue, None si elle n'a pas pu se terminer."""
+    name = client.account.name
+    game_data = await client.get_game()
+    if not game_data or not game_data.get('game_id'):
+        logger.error(f"[{name}] Could not retrieve or create game.")
+        return None
+    game_id = game_data['game_id']
+    attempts = game_data.get('attempts') or 0
+    # Les sessions ne touchent pas à la DB : le hook passe par la file du writer
+    engine = WordleEngine(game_data.get('word_length') or 5, db,
+                          on_outcome=lambda kind, word: updates.put_nowait((kind, word)))
+    engine.resume(game_data.get('board', []))
+
+    while attempts < MAX_ATTEMPTS:
+        guess_word = engine.next_guess()
+        if guess_word is None:
+            logger.error(f"[{name}] No playable word left.")
+            return None
+        res = await client.guess(game_id, guess_word)
+        if not res:
+            return None
+        if res.get('status') == "invalid_word":
+            engine.reject(guess_word)
+            continue
+        attempts = res.get('attempts', attempts + 1)
+        if res.get('game_over'):
+            engine.finish(res.get('word'))
+            logger.info(f"[{name}] {'Won' if res.get('won') else 'Lost'} in {attempts} attempt(s): {res.get('word')}")
+            return bool(res.get('won'))
+        if 'result' in res:
+            engine.update(guess_word, res['result'])
+    return None
+
+
+async def run_session(client: AccountClient, db: WordleDB, updates: asyncio.Queue, stats: Dict[str, int],
+                      games: Optional[int], cooldown: float) -> None:
+    played = 0
+    while games is None or played < games:
+        outcome = await play_game(client, db, updates)
+        played += 1
+        stats["games"] += 1
+        stats["won" if outcome else "lost" if outcome is False else "failed"] += 1
+        if games is None or played < games:
+            await asyncio.sleep(cooldown)
+
+
+async def train(accounts: List[Account], base_url: str = BASE_URL, games: Optional[int] = None,
+                cooldown: float = COOLDOWN, db: Optional[WordleDB] = None,
+                limiter: Optional[AdaptiveRateLimiter] = None) -> Dict[str, int]:
+    """
+    Lance une session par compte (`games` parties chacune, None = sans fin). Une session
+    qui plante est journalisée sans arrêter les autres ; sur interruption, les résultats
+    encore en file sont écrits dans la DB avant sa fermeture.
+    """
+    db = db or WordleDB.load()
+    limiter = limiter or AdaptiveRateLimiter()
+    updates: asyncio.Queue = asyncio.Queue()
+    stats = {"games": 0, "won": 0, "lost": 0, "failed": 0}
+    clients = [AccountClient(account, limiter, base_url) for account in accounts]
+    writer = asyncio.create_task(db_writer(db, updates))
+    try:
+        results = await asyncio.gather(*(run_session(c, db, updates, stats, games, cooldown) for c in clients),
+                                       return_exceptions=True)
+        for client, result in zip(clients, results):
+            if isinstance(result, Exception):
+                logger.error(f"[{client.account.name}] Session stopped: {result!r}")
+        await updates.join()
+    finally:
+        writer.cancel()
+        # Le writer ne s'arrête que sur queue.get() : aucun résultat n'est à moitié écrit
+        while not updates.empty():
+            kind, word = updates.get_nowait()
+            db.record(kind, word)
+            updates.task_done()
+        for client in clients:
+            client.session.log_metrics(client.account.name)
+            client.close()
+        db.close()
+    stats["throttled"] = limiter.throttled
+    return stats
+
+
+def main(base_url: str = BASE_URL, games: Optional[int] = None, cooldown: float = COOLDOWN) -> None:
+    accounts = load_accounts()
+    if not accounts:
+        print("Error: Tokens not found in .env file.")
+        return
+    print(f"Training with {len(accounts)} concurrent session(s) on {base_url}...")
+    started = time.time()
+    stats = asyncio.run(train(accounts, base_url, games, cooldown))
+    print(f"{stats['games']} games in {time.time() - started:.0f}s: {stats['won']} won, {stats['lost']} lost, "
+          f"{stats['failed']} failed, {stats['throttled']} throttled request(s)")
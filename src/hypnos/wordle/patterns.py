@@ -0,0 +1,176 @@
+"""
+Feedback patterns for Wordle, computed with NumPy.
+
+The feedback of a guess against an answer (absent / present / correct per
+letter, with the usual rules for repeated letters) is encoded as one base-3
+integer: sum(status_i * 3**i) with absent=0, present=1, correct=2.
+
+For a word list of one length, `PatternTable` holds the full guess x answer
+matrix of these codes. Candidate filtering is then a single comparison
+between a matrix row and the code of the feedback received. The matrix is
+cached in data/cache as a .npy file named by the hash of the word list, and
+memory-mapped on later runs.
+"""
+
+import hashlib
+from importlib import resources
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+DATA_PATH = resources.files("hypnos.wordle.data")
+CACHE_PATH = DATA_PATH / "cache"
+
+STATUSES = ("absent", "present", "correct")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# Lignes de guesses traitées par bloc pendant la construction (mémoire ~ bloc x N x L)
+BUILD_CHUNK = 256
+
+
+def code_dtype(length: int) -> np.dtype:
+    """Plus petit entier non signé contenant 3**length codes (uint8 jusqu'à 5 lettres)."""
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if 3 ** length <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    raise ValueError(f"Words of length {length} do not fit a 64-bit pattern code")
+
+
+def encode_words(words: Sequence[str]) -> np.ndarray:
+    """(N,) mots de même longueur -> (N, L) octets (les mots normalisés sont en ASCII)."""
+    if not words:
+        return np.zeros((0, 0), dtype=np.uint8)
+    return np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(len(words), -1)
+
+
+def encode_result(result: Iterable[str]) -> int:
+    """['absent', 'present', 'correct', ...] (réponse de l'API) -> code base 3."""
+    return sum(STATUS_CODES[status] * 3 ** i for i, status in enumerate(result))
+
+
+def decode_result(code: int, length: int) -> List[str]:
+    statuses = []
+    for _ in range(length):
+        code, status = divmod(code, 3)
+        statuses.append(STATUSES[status])
+    return statuses
+
+
+def feedback_codes(guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """
+    (G, L) x (A, L) mots encodés -> (G, A) codes de feedback.
+    Les lettres répétées suivent les règles habituelles : les "correct" sont servis d'abord,
+    puis les "present" de gauche à droite tant que la réponse contient encore la lettre.
+    """
+    length = guesses.shape[1]
+    green = guesses[:, None, :] == answers[None, :, :]  # (G, A, L)
+    # repeats[g, i, j] : lettres i et j du guess identiques
+    repeats = (guesses[:, :, None] == guesses[:, None, :]).astype(np.float32)
+
+    # Occurrences de la lettre i du guess dans la réponse, moins celles déjà servies en "correct"
+    counts = np.zeros((len(answers), 256), dtype=np.float32)
+    np.add.at(counts, (np.repeat(np.arange(len(answers)), length), answers.ravel()), 1)
+    available = counts[:, guesses].transpose(1, 0, 2) - green.astype(np.float32) @ repeats
+    # Occurrences non correctes de la même lettre plus à gauche, servies avant la position i
+    used = (~green).astype(np.float32) @ np.tril(repeats, k=-1).transpose(0, 2, 1)
+    present = ~green & (available > used)
+
+    status = green.astype(code_dtype(length)) * 2 + present
+    powers = (3 ** np.arange(length)).astype(status.dtype)
+    return (status * powers).sum(axis=2, dtype=status.dtype)
+
+
+def words_hash(words: Sequence[str]) -> str:
+    return hashlib.sha1("\n".join(words).encode("utf-8")).hexdigest()[:16]
+
+
+class PatternTable:
+    """Matrice guess x réponse des codes de feedback pour une liste de mots de même longueur."""
+
+    def __init__(self, words: Sequence[str], matrix: np.ndarray):
+        self.words = list(words)
+        self.index: Dict[str, int] = {w: i for i, w in enumerate(self.words)}
+        self.matrix = matrix
+        self.encoded = encode_words(self.words)
+
+    @classmethod
+    def build(cls, words: Sequence[str]) -> "PatternTable":
+        encoded = encode_words(words)
+        length = encoded.shape[1] if len(words) else 0
+        matrix = np.empty((len(words), len(words)), dtype=code_dtype(length))
+        for start in range(0, len(words), BUILD_CHUNK):
+            matrix[start:start + BUILD_CHUNK] = feedback_codes(encoded[start:start + BUILD_CHUNK], encoded)
+        return cls(words, matrix)
+
+    @classmethod
+    def load(cls, words: Sequence[str], cache_dir=CACHE_PATH) -> "PatternTable":
+        """
+        Table des mots `words` (triés, de même longueur), depuis le cache disque si la même
+        liste a déjà été vue, sinon construite et écrite. Les anciens caches de cette
+        longueur sont supprimés.
+        """
+        words = sorted(set(words))
+        length = len(words[0]) if words else 0
+        path = cache_dir / f"patterns_{length}_{words_hash(words)}.npy"
+        if path.exists():
+            return cls(words, np.load(path, mmap_mode="r"))
+
+        table = cls.build(words)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in cache_dir.glob(f"patterns_{length}_*.npy"):
+            stale.unlink()
+        np.save(path, table.matrix)
+        return cls(words, np.load(path, mmap_mode="r"))
+
+    def row(self, guess: str) -> np.ndarray:
+        """Codes de `guess` contre tous les mots (calculés à la volée s'il n'est pas dans la table)."""
+        i = self.index.get(guess)
+        if i is not None:
+            return self.matrix[i]
+        return feedback_codes(encode_words([guess]), self.encoded)[0]
+
+    def extend(self, words: Iterable[str]) -> "PatternTable":
+        """
+        Table en mémoire avec `words` ajoutés à la fin (ceux absents de la table), sans
+        recalculer la matrice existante : seules les nouvelles lignes et colonnes le sont.
+        """
+        new = sorted(set(words) - self.index.keys())
+        if not new:
+            return self
+        encoded = encode_words(new)
+        size = len(self.words)
+        matrix = np.empty((size + len(new), size + len(new)), dtype=self.matrix.dtype)
+        matrix[:size, :size] = self.matrix
+        matrix[:size, size:] = feedback_codes(self.encoded, encoded)
+        matrix[size:] = feedback_codes(encoded, np.concatenate([self.encoded, encoded]))
+        return PatternTable(self.words + new, matrix)
+
+    def indices(self, words: Iterable[str]) -> np.ndarray:
+        return np.array([self.index[w] for w in words if w in self.index], dtype=np.int64)
+
+    def filter(self, candidates: np.ndarray, guess: str, result: Sequence[str]) -> np.ndarray:
+        """Indices de `candidates` compatibles avec le feedback `result` obtenu pour `guess`."""
+        return candidates[self.row(guess)[candidates] == encode_result(result)]
+
+
+_tables: Dict[Tuple[int, str], PatternTable] = {}
+
+
+def get_table(words: Sequence[str], extra: Iterable[str] = ()) -> PatternTable:
+    """
+    PatternTable.load de `words` avec un cache en mémoire pour la durée du processus,
+    étendue des mots `extra` (ex : solutions connues hors dictionnaire). Le cache disque
+    ne dépend que de `words` : apprendre de nouvelles solutions ne le reconstruit pas.
+    """
+    words = sorted(set(words))
+    key = (len(words[0]) if words else 0, words_hash(words))
+    if key not in _tables:
+        _tables[key] = PatternTable.load(words)
+    table = _tables[key]
+    extra = tuple(sorted(set(extra) - table.index.keys()))
+    if not extra:
+        return table
+    extended_key = (key[0], words_hash((key[1],) + extra))
+    if extended_key not in _tables:
+        _tables[extended_key] = table.extend(extra)
+    return _tables[extended_key]
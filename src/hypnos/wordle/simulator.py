@@ -0,0 +1,68 @@
+"""
+Offline Wordle referee.
+
+WordleGame holds a hidden word and answers guesses like the API does: the
+same `correct/present/absent` results, the same game-over payload (with the
+answer revealed) and the same 400 details for rejected words. It lets the
+solver be played and measured without a network (hypnos.wordle.bench) and
+backs the local stub server (hypnos.wordle.stub).
+"""
+
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from hypnos.wordle.patterns import decode_result, encode_words, feedback_codes
+
+MAX_ATTEMPTS = 6
+
+
+def feedback(guess: str, answer: str) -> List[str]:
+    """['correct', 'present', 'absent', ...] comme l'API."""
+    code = int(feedback_codes(encode_words([guess]), encode_words([answer]))[0, 0])
+    return decode_result(code, len(answer))
+
+
+class WordleGame:
+    def __init__(self, word: str, valid_words: Optional[Iterable[str]] = None,
+                 max_attempts: int = MAX_ATTEMPTS, game_id: Optional[str] = None):
+        self.word = word.upper()
+        # None = tout mot de la bonne longueur est accepté ; un set déjà construit est partagé
+        if valid_words is not None and not isinstance(valid_words, (set, frozenset)):
+            valid_words = set(valid_words)
+        self.valid = valid_words
+        self.max_attempts = max_attempts
+        self.game_id = game_id or uuid.uuid4().hex
+        self.board: List[List[Dict[str, str]]] = []
+        self.game_over = False
+        self.won = False
+
+    @property
+    def attempts(self) -> int:
+        return len(self.board)
+
+    def state(self) -> Dict:
+        """Partie telle que renvoyée par /active-game et /new-game (sans la réponse)."""
+        return {
+            "game_id": self.game_id,
+            "word_length": len(self.word),
+            "attempts": self.attempts,
+            "board": self.board,
+        }
+
+    def guess(self, word: str) -> Tuple[int, Dict]:
+        """(code HTTP, payload) de POST /<game_id>/guess."""
+        if self.game_over:
+            return 404, {"detail": "Game not found"}
+        word = word.upper()
+        if len(word) != len(self.word):
+            return 400, {"detail": "Guess must be X letters"}
+        if self.valid is not None and word not in self.valid:
+            return 400, {"detail": "Not a valid word"}
+        result = feedback(word, self.word)
+        self.board.append([{"letter": l, "status": s} for l, s in zip(word, result)])
+        self.won = word == self.word
+        self.game_over = self.won or self.attempts >= self.max_attempts
+        payload = {"result": result, "attempts": self.attempts, "game_over": self.game_over, "won": self.won}
+        if self.game_over:
+            payload["word"] = self.word
+        return 200, payload
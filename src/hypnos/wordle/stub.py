@@ -0,0 +1,151 @@
+"""
+Local stub of the Wordle API, to run the training driver offline.
+
+Serves the same routes as https://play.hypnos2026.fr/api/arg/wordle
+(GET /active-game, POST /new-game, POST /<game_id>/guess) on 127.0.0.1, with
+one game per auth_token cookie. Hidden words are drawn from a given list, and
+each game is refereed by hypnos.wordle.simulator. `rate_limit` answers 429
+beyond that many requests per second over all players, with a Retry-After
+giving the time until the window frees up, to exercise the rate limiter.
+
+    with StubServer(words) as server:
+        asyncio.run(multitrain.train(accounts, base_url=server.url, games=10, cooldown=0))
+"""
+
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.cookies import SimpleCookie
+from typing import Dict, Optional, Sequence
+
+from hypnos.wordle.dictionary import load_dictionary
+from hypnos.wordle.simulator import WordleGame
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "StubServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _player(self) -> str:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return cookie["auth_token"].value if "auth_token" in cookie else ""
+
+    def _throttled(self) -> bool:
+        wait = self.server.admit()
+        if wait is None:
+            return False
+        self._reply(429, {"detail": "Too many requests"}, {"Retry-After": f"{wait:.3f}"})
+        return True
+
+    def do_GET(self):
+        if self._throttled():
+            return
+        if self.path.rstrip("/").endswith("/active-game"):
+            game = self.server.games.get(self._player())
+            if game and not game.game_over:
+                return self._reply(200, {"has_active_game": True, "game": game.state()})
+            return self._reply(200, {"has_active_game": False})
+        self._reply(404, {"detail": "Not found"})
+
+    def do_POST(self):
+        if self._throttled():
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        parts = self.path.strip("/").split("/")
+        if parts[-1] == "new-game":
+            game = self.server.new_game(self._player())
+            return self._reply(200, game.state())
+        if parts[-1] == "guess" and len(parts) >= 2:
+            return self._reply(*self.server.guess(self._player(), parts[-2], body.get("guess", "")))
+        self._reply(404, {"detail": "Not found"})
+
+
+class StubServer(ThreadingHTTPServer):
+    def __init__(self, words: Sequence[str], valid_words: Optional[Sequence[str]] = None, seed: int = 0,
+                 rate_limit: float = 0.0, port: int = 0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.words = list(words)
+        self.valid = set(valid_words or words)
+        self.rng = random.Random(seed)
+        self.rate_limit = rate_limit
+        self.games: Dict[str, WordleGame] = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self._recent: deque = deque()
+        self._thread: Optional[threading.Thread] = None
+
+    def admit(self) -> Optional[float]:
+        """
+        Fenêtre glissante d'une seconde : None si la requête passe, sinon le délai
+        (secondes) avant qu'une place se libère, au-delà de `rate_limit` requêtes.
+        """
+        with self.lock:
+            self.requests += 1
+            if not self.rate_limit:
+                return None
+            now = time.monotonic()
+            while self._recent and self._recent[0] <= now - 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.rate_limit:
+                self.throttled += 1
+                return self._recent[0] + 1.0 - now
+            self._recent.append(now)
+            return None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def new_game(self, player: str) -> WordleGame:
+        with self.lock:
+            word = self.rng.choice(self.words)
+        game = WordleGame(word, self.valid)
+        self.games[player] = game
+        return game
+
+    def guess(self, player: str, game_id: str, word: str):
+        game = self.games.get(player)
+        if not game or game.game_id != game_id:
+            return 404, {"detail": "Game not found"}
+        return game.guess(word)
+
+    def __enter__(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main(port: int = 8026, rate_limit: float = 0.0, length: int = 5) -> None:
+    words = load_dictionary(length)
+    if not words:
+        print(f"Error: no {length}-letter word in the dictionary.")
+        return
+    server = StubServer(words, rate_limit=rate_limit, port=port)
+    print(f"Wordle stub serving {len(words)} words on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
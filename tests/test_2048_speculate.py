@@ -0,0 +1,50 @@
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+
+from hypnos.twothousandfortyeight import solve
+from hypnos.twothousandfortyeight.bitboard import to_bitboard
+
+# Début de partie : une recherche à budget long ne finit pas avant la réponse
+AFTERSTATE = to_bitboard([
+    [2, 0, 0, 0],
+    [0, 0, 0, 0],
+    [0, 0, 4, 0],
+    [0, 0, 0, 0],
+])
+
+
+class SpeculateTest(unittest.TestCase):
+    def test_returns_as_soon_as_the_reply_lands_mid_search(self):
+        pending = Future()
+        reply_delay = 0.2
+        timer = threading.Timer(reply_delay, pending.set_result, args=({"board": []},))
+        started = time.time()
+        timer.start()
+        try:
+            answers = solve.speculate(AFTERSTATE, pending, time_budget=30.0)
+        finally:
+            timer.cancel()
+        elapsed = time.time() - started
+
+        self.assertTrue(pending.done())
+        # Interrompue dans la première recherche (30 s de budget), pas à sa fin
+        self.assertLess(elapsed, reply_delay + 0.5)
+        # Le coup d'une recherche interrompue n'est pas gardé
+        self.assertEqual(answers, {})
+
+    def test_fixed_depth_search_raises_when_aborted(self):
+        with solve.abort_scope(lambda: True):
+            with self.assertRaises(solve.SearchAborted):
+                solve.get_best_move(AFTERSTATE, table=None)
+
+    def test_abort_scope_is_restored(self):
+        with solve.abort_scope(lambda: True):
+            self.assertTrue(solve.search_aborted())
+        self.assertFalse(solve.search_aborted())
+        self.assertIsNotNone(solve.get_best_move(AFTERSTATE, table=None))
+
+
+if __name__ == "__main__":
+    unittest.main()
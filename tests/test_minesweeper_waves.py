@@ -0,0 +1,65 @@
+import contextlib
+import io
+import unittest
+
+from hypnos.minesweeper.simulator import LocalSession
+from hypnos.minesweeper.solver import MinesweeperSmartSolver, neighbor_sum
+
+
+def start_game(mines, rows=5, cols=5, latency=0.0, flag_mines=True):
+    """Solveur branché sur une partie locale aux mines imposées, aucune case révélée."""
+    session = LocalSession(rows, cols, len(mines), latency=latency)
+    solver = MinesweeperSmartSolver(session=session, flag_mines=flag_mines)
+    data = solver._api_call("new-game", {})
+    game = session.game
+    for r, c in mines:
+        game.mines[r, c] = True
+    game.counts = neighbor_sum(game.mines)
+    game.started = True
+    solver.reset(data["rows"], data["cols"])
+    solver.update_grid(data)
+    return solver, session
+
+
+class WaveTest(unittest.TestCase):
+    def test_adjacent_reveals_in_one_wave(self):
+        # (0, 1), (1, 0) et (1, 1) se touchent et touchent la mine (0, 0) : une seule vague,
+        # requêtes concurrentes (latence simulée) que le serveur applique une par une
+        solver, session = start_game([(0, 0), (4, 4)], latency=0.02)
+        reveals = [('reveal', 0, 1), ('reveal', 1, 0), ('reveal', 1, 1)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            solver.execute_batch([('flag', 0, 0)] + reveals)
+            solver.sync()
+
+        game = session.game
+        self.assertFalse(game.game_over)
+        for _, r, c in reveals:
+            self.assertTrue(game.revealed[r, c])
+            self.assertTrue(solver.revealed[r, c])
+        # Aucune cascade : seules les cases demandées sont ouvertes
+        self.assertEqual(int(game.revealed.sum()), len(reveals))
+        self.assertTrue(solver.waves)
+        # Une vague de reveals puis une vague de flags
+        self.assertEqual(solver.round_trips, 2)
+        self.assertTrue(game.flagged[0, 0])
+
+    def test_flags_can_stay_local(self):
+        solver, session = start_game([(0, 0), (4, 4)], flag_mines=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            solver.execute_batch([('flag', 0, 0), ('reveal', 0, 1), ('reveal', 1, 0)])
+        self.assertFalse(session.game.flagged.any())
+        self.assertTrue(solver.known_mines[0, 0])
+        self.assertEqual(solver.round_trips, 1)
+
+    def test_cascading_wave_switches_to_sequential_reveals(self):
+        # (3, 3) vaut 0 : le serveur ouvre toute la zone, la vague a débordé. (0, 0),
+        # entourée de mines, reste cachée : la partie continue
+        solver, session = start_game([(0, 1), (1, 0), (1, 1)])
+        with contextlib.redirect_stdout(io.StringIO()):
+            solver.send_wave([('reveal', 3, 3)])
+        self.assertFalse(session.game.game_over)
+        self.assertFalse(solver.waves)
+
+
+if __name__ == "__main__":
+    unittest.main()
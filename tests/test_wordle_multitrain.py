@@ -0,0 +1,50 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from hypnos.wordle import multitrain
+from hypnos.wordle.db import SOLUTION
+
+WORDS = ["ARBRE", "BALLE", "CHIEN"]
+
+
+class FakeDB:
+    def __init__(self):
+        self.solutions = []
+        self.saved = None
+
+    def record(self, kind, word):
+        self.solutions.append(word)
+        return True
+
+    def close(self):
+        self.saved = list(self.solutions)
+
+
+async def fake_play_game(client, db, updates):
+    """account1 plante après sa première partie, account2 trouve un mot par partie."""
+    await asyncio.sleep(0.01)
+    if client.account.name == "account1":
+        if client.played:
+            raise RuntimeError("session lost")
+    else:
+        updates.put_nowait((SOLUTION, WORDS[client.played]))
+    client.played += 1
+    return True
+
+
+class TrainTest(unittest.TestCase):
+    def test_failed_session_does_not_lose_other_solutions(self):
+        accounts = [multitrain.Account("account1", "a", "b"), multitrain.Account("account2", "c", "d")]
+        db = FakeDB()
+        with mock.patch.object(multitrain, "play_game", fake_play_game), \
+                mock.patch.object(multitrain.AccountClient, "played", 0, create=True):
+            stats = asyncio.run(multitrain.train(accounts, base_url="http://127.0.0.1:1", games=len(WORDS),
+                                                 cooldown=0.0, db=db))
+
+        self.assertEqual(db.saved, WORDS)
+        self.assertEqual(stats["won"], 1 + len(WORDS))
+
+
+if __name__ == "__main__":
+    unittest.main()